@@ -18,24 +18,40 @@ Usage:
 
 Prerequisites:
     - requests library: pip install requests
+    - aiohttp library (optional, concurrent repository fetches): pip install aiohttp
     - ARTIFACTORY_ACCESS_TOKEN environment variable set
 """
 
 import os
 import sys
+import io
 import json
+import time
+import atexit
+import asyncio
+import hashlib
 import argparse
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, TextIO, Tuple
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     HAS_REQUESTS = True
 except ImportError:
     HAS_REQUESTS = False
     print("Warning: 'requests' library not installed.")
     print("Install with: pip install requests")
 
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
 try:
     from config_loader import get_artifactory_config
     HAS_CONFIG_LOADER = True
@@ -43,10 +59,83 @@ except ImportError:
     HAS_CONFIG_LOADER = False
 
 
+# Concurrency limits for async repository fetches
+MAX_CONCURRENT_REQUESTS = 32
+MAX_CONNECTIONS_PER_HOST = 64
+
+# Retry policy for throttled or briefly unavailable Artifactory responses
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.3
+RETRY_STATUS_CODES = [429, 502, 503, 504]
+
+# Repository attributes rendered from the full repository configuration
+REPOSITORY_DETAIL_FIELDS = ('description', 'notes')
+
+# Response cache for idempotent GET requests
+CACHE_MAX_ENTRIES = 512
+CACHE_TTL_SECONDS = 300
+
+
+# =============================================================================
+# RESPONSE CACHE
+# =============================================================================
+
+class _TTLCache:
+    """Bounded LRU cache whose entries expire after a time-to-live."""
+
+    def __init__(self, maxsize: int = CACHE_MAX_ENTRIES, default_ttl: float = CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self._data: OrderedDict = OrderedDict()  # key -> (expires_at, value)
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None):
+        """Store a value, evicting the least recently used entry when full."""
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached entries."""
+        self._data.clear()
+
+
 # =============================================================================
 # ARTIFACTORY API CLIENT
 # =============================================================================
 
+# Sessions shared by every client for the same instance and token
+_SESSIONS: Dict[Tuple[str, str], 'requests.Session'] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def _close_sessions():
+    """Close all shared sessions."""
+    with _SESSIONS_LOCK:
+        for session in _SESSIONS.values():
+            session.close()
+        _SESSIONS.clear()
+
+
+atexit.register(_close_sessions)
+
+
 class ArtifactoryClient:
     """Simple Artifactory API client."""
 
@@ -60,24 +149,102 @@ class ArtifactoryClient:
                 "Set ARTIFACTORY_ACCESS_TOKEN environment variable."
             )
 
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.headers = {
             'Authorization': f'Bearer {self.access_token}',
             'Content-Type': 'application/json'
-        })
+        }
+
+        # Reuse the pooled session (and its open connections) across clients
+        session_key = (self.url, self.access_token)
+        with _SESSIONS_LOCK:
+            self.session = _SESSIONS.get(session_key)
+            if self.session is None:
+                self.session = _SESSIONS[session_key] = self._build_session()
+
+        self._cache = _TTLCache()
+
+    def _build_session(self) -> 'requests.Session':
+        """Create a pooled, retrying session carrying this client's auth headers."""
+        session = requests.Session()
+        session.headers.update(self.headers)
+
+        # Size the pool for concurrent callers and back off on 429/5xx
+        adapter = HTTPAdapter(
+            pool_connections=MAX_CONNECTIONS_PER_HOST,
+            pool_maxsize=MAX_CONNECTIONS_PER_HOST,
+            max_retries=Retry(
+                total=RETRY_TOTAL,
+                backoff_factor=RETRY_BACKOFF_FACTOR,
+                status_forcelist=RETRY_STATUS_CODES,
+            ),
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    @staticmethod
+    def _cache_key(url: str, params: Optional[Dict]) -> bytes:
+        """Build the response cache key for a GET request."""
+        return hashlib.md5(f"{url}|{sorted((params or {}).items())}".encode()).digest()
 
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict:
-        """Make an API request to Artifactory."""
+        """Make an API request to Artifactory. GET responses are cached."""
         url = f"{self.url}/artifactory/api/{endpoint}"
 
+        if method == 'GET':
+            cache_key = self._cache_key(url, kwargs.get('params'))
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+        else:
+            # Any write may change what subsequent GETs return
+            self._cache.clear()
+
         try:
             response = self.session.request(method, url, **kwargs)
             response.raise_for_status()
-            return response.json() if response.content else {}
+            result = response.json() if response.content else {}
         except requests.exceptions.RequestException as e:
             print(f"API request failed: {e}")
             return {'error': str(e)}
 
+        if method == 'GET':
+            self._cache.set(cache_key, result)
+
+        return result
+
+    def async_session(self) -> 'aiohttp.ClientSession':
+        """Create an aiohttp session carrying this client's auth headers."""
+        connector = aiohttp.TCPConnector(limit_per_host=MAX_CONNECTIONS_PER_HOST)
+        return aiohttp.ClientSession(headers=self.headers, connector=connector)
+
+    async def _amake_request(self, session: 'aiohttp.ClientSession', method: str,
+                             endpoint: str, **kwargs) -> Dict:
+        """Make an API request to Artifactory using an aiohttp session."""
+        url = f"{self.url}/artifactory/api/{endpoint}"
+
+        if method == 'GET':
+            cache_key = self._cache_key(url, kwargs.get('params'))
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+        else:
+            self._cache.clear()
+
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                response.raise_for_status()
+                content = await response.read()
+                result = json.loads(content) if content else {}
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            print(f"API request failed: {e}")
+            return {'error': str(e)}
+
+        if method == 'GET':
+            self._cache.set(cache_key, result)
+
+        return result
+
     def ping(self) -> bool:
         """Test connectivity to Artifactory."""
         try:
@@ -91,20 +258,58 @@ class ArtifactoryClient:
         result = self._make_request('GET', 'repositories')
         return result if isinstance(result, list) else []
 
+    async def aget_repositories(self, session: 'aiohttp.ClientSession') -> List[Dict]:
+        """Get list of all repositories (async)."""
+        result = await self._amake_request(session, 'GET', 'repositories')
+        return result if isinstance(result, list) else []
+
     def get_repository(self, repo_key: str) -> Dict:
         """Get details of a specific repository."""
         return self._make_request('GET', f'repositories/{repo_key}')
 
+    def get_repository_configurations(self) -> Dict[str, Dict]:
+        """
+        Get the full configuration of every repository in one request.
+
+        Returns a dict keyed by repository key, or an empty dict if the
+        endpoint is not available on this Artifactory version.
+        """
+        result = self._make_request('GET', 'repositories/configurations')
+
+        if not isinstance(result, dict) or 'error' in result:
+            return {}
+
+        # Response is grouped by class: {"LOCAL": [...], "REMOTE": [...], ...}
+        return {
+            repo['key']: repo
+            for repos in result.values() if isinstance(repos, list)
+            for repo in repos if 'key' in repo
+        }
+
+    async def aget_repository(self, session: 'aiohttp.ClientSession', repo_key: str) -> Dict:
+        """Get details of a specific repository (async)."""
+        return await self._amake_request(session, 'GET', f'repositories/{repo_key}')
+
     def get_users(self) -> List[Dict]:
         """Get list of users."""
         result = self._make_request('GET', 'security/users')
         return result if isinstance(result, list) else []
 
+    async def aget_users(self, session: 'aiohttp.ClientSession') -> List[Dict]:
+        """Get list of users (async)."""
+        result = await self._amake_request(session, 'GET', 'security/users')
+        return result if isinstance(result, list) else []
+
     def get_groups(self) -> List[Dict]:
         """Get list of groups."""
         result = self._make_request('GET', 'security/groups')
         return result if isinstance(result, list) else []
 
+    async def aget_groups(self, session: 'aiohttp.ClientSession') -> List[Dict]:
+        """Get list of groups (async)."""
+        result = await self._amake_request(session, 'GET', 'security/groups')
+        return result if isinstance(result, list) else []
+
     def get_permissions(self) -> List[Dict]:
         """Get list of permission targets."""
         result = self._make_request('GET', 'security/permissions')
@@ -121,8 +326,21 @@ class ArtifactoryTerraformGenerator:
     def __init__(self, client: ArtifactoryClient):
         self.client = client
 
-    def generate_repository_resource(self, repo: Dict) -> str:
-        """Generate Terraform resource for a repository."""
+    @staticmethod
+    def needs_details(repo: Dict) -> bool:
+        """Check whether a list entry lacks attributes only the detail endpoint returns."""
+        return any(field not in repo for field in REPOSITORY_DETAIL_FIELDS)
+
+    def write_repository_resource(self, out: TextIO, repo: Dict, details: Optional[Dict] = None):
+        """
+        Write the Terraform resource for a repository to a text stream.
+
+        Args:
+            out: Writable text stream.
+            repo: Repository entry from the repositories list.
+            details: Full repository configuration. Fetched if not provided
+                and the list entry does not already carry the needed fields.
+        """
         repo_key = repo.get('key', '')
         repo_type = repo.get('type', 'local').lower()
         package_type = repo.get('packageType', 'generic').lower()
@@ -130,50 +348,133 @@ class ArtifactoryTerraformGenerator:
         # Sanitize resource name
         resource_name = repo_key.replace('-', '_').replace('.', '_')
 
-        lines = [
-            f'resource "artifactory_{repo_type}_repository" "{resource_name}" {{',
-            f'  key          = "{repo_key}"',
-            f'  package_type = "{package_type}"',
-        ]
+        out.write(f'resource "artifactory_{repo_type}_repository" "{resource_name}" {{\n')
+        out.write(f'  key          = "{repo_key}"\n')
+        out.write(f'  package_type = "{package_type}"\n')
 
         # Add optional attributes based on repo details
-        full_repo = self.client.get_repository(repo_key)
-
-        if 'description' in full_repo:
-            lines.append(f'  description  = "{full_repo["description"]}"')
+        if details is None:
+            details = self.client.get_repository(repo_key) if self.needs_details(repo) else repo
 
-        if 'notes' in full_repo:
-            lines.append(f'  notes        = "{full_repo["notes"]}"')
+        if 'description' in details:
+            out.write(f'  description  = "{details["description"]}"\n')
 
-        lines.append('}')
-        lines.append('')
+        if 'notes' in details:
+            out.write(f'  notes        = "{details["notes"]}"\n')
 
-        return '\n'.join(lines)
+        out.write('}\n')
 
-    def generate_all_repositories(self) -> str:
-        """Generate Terraform configuration for all repositories."""
+    def generate_repository_resource(self, repo: Dict, details: Optional[Dict] = None) -> str:
+        """Generate Terraform resource for a repository."""
+        buf = io.StringIO()
+        self.write_repository_resource(buf, repo, details)
+        return buf.getvalue()
+
+    async def _fetch_repo_async(self, session: 'aiohttp.ClientSession',
+                                semaphore: asyncio.Semaphore, repo: Dict,
+                                known: Dict[str, Dict]) -> Dict:
+        """Fetch a single repository's details, bounded by the semaphore."""
+        if not self.needs_details(repo):
+            return repo
+
+        if repo.get('key') in known:
+            return known[repo['key']]
+
+        async with semaphore:
+            return await self.client.aget_repository(session, repo.get('key', ''))
+
+    async def _write_all_async(self, out: TextIO, repos: List[Dict], known: Dict[str, Dict]):
+        """Fetch all repository details concurrently, writing each block as it resolves."""
+        # Cap in-flight requests to stay under Artifactory rate limits
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        async with self.client.async_session() as session:
+            tasks = [
+                asyncio.create_task(self._fetch_repo_async(session, semaphore, repo, known))
+                for repo in repos
+            ]
+
+            # Await in list order so the output is deterministic; later
+            # fetches keep running while earlier blocks are written.
+            for i, (repo, task) in enumerate(zip(repos, tasks)):
+                details = await task
+                if i:
+                    out.write('\n')
+                self.write_repository_resource(out, repo, details)
+
+    def generate_all_repositories(self, out: TextIO):
+        """Stream Terraform configuration for all repositories to a text stream."""
         repos = self.client.get_repositories()
 
         if not repos:
-            return "# No repositories found\n"
+            out.write("# No repositories found\n")
+            return
 
-        lines = [
-            "# =============================================================================",
-            "# Artifactory Repositories - Auto-generated",
-            "# =============================================================================",
-            "",
-        ]
+        out.write(
+            "# =============================================================================\n"
+            "# Artifactory Repositories - Auto-generated\n"
+            "# =============================================================================\n"
+            "\n"
+        )
 
-        for repo in repos:
-            lines.append(self.generate_repository_resource(repo))
+        # One batch request replaces the per-repository fetches; anything
+        # it does not cover falls back to fetching that repository alone.
+        known = {}
+        if any(self.needs_details(repo) for repo in repos):
+            known = self.client.get_repository_configurations()
 
-        return '\n'.join(lines)
+        if HAS_AIOHTTP:
+            asyncio.run(self._write_all_async(out, repos, known))
+            return
+
+        for i, repo in enumerate(repos):
+            if i:
+                out.write('\n')
+            self.write_repository_resource(out, repo, known.get(repo.get('key')))
 
 
 # =============================================================================
 # COMMANDS
 # =============================================================================
 
+async def _discover_all(client: ArtifactoryClient) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """Fetch repositories, users and groups concurrently."""
+    def report(label: str):
+        def callback(task: asyncio.Task):
+            if not task.cancelled() and task.exception() is None:
+                print(f"Found {len(task.result())} {label}")
+        return callback
+
+    async with client.async_session() as session:
+        tasks = []
+        for label, coro in (
+            ('repositories', client.aget_repositories(session)),
+            ('users', client.aget_users(session)),
+            ('groups', client.aget_groups(session)),
+        ):
+            task = asyncio.create_task(coro)
+            task.add_done_callback(report(label))
+            tasks.append(task)
+
+        repos, users, groups = await asyncio.gather(*tasks)
+
+    return repos, users, groups
+
+
+def _discover_all_sync(client: ArtifactoryClient) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """Fetch repositories, users and groups one after another."""
+    repos = client.get_repositories()
+    print(f"Found {len(repos)} repositories")
+
+    users = client.get_users()
+    print(f"Found {len(users)} users")
+
+    groups = client.get_groups()
+    print(f"Found {len(groups)} groups")
+
+    return repos, users, groups
+
+
 def cmd_discover(args):
     """Discover Artifactory resources."""
     if not HAS_REQUESTS:
@@ -197,24 +498,17 @@ def cmd_discover(args):
 
         print("✓ Connected successfully\n")
 
-        # Discover repositories
-        print("Discovering repositories...")
-        repos = client.get_repositories()
-        print(f"Found {len(repos)} repositories:\n")
+        # Discover repositories, users and groups
+        print("Discovering repositories, users and groups...")
+        if HAS_AIOHTTP:
+            repos, users, groups = asyncio.run(_discover_all(client))
+        else:
+            repos, users, groups = _discover_all_sync(client)
 
+        print("\nRepositories:\n")
         for repo in repos:
             print(f"  - {repo.get('key')} ({repo.get('type')}, {repo.get('packageType')})")
 
-        # Discover users
-        print("\nDiscovering users...")
-        users = client.get_users()
-        print(f"Found {len(users)} users")
-
-        # Discover groups
-        print("\nDiscovering groups...")
-        groups = client.get_groups()
-        print(f"Found {len(groups)} groups")
-
         # Save inventory
         if args.output:
             inventory = {
@@ -256,14 +550,14 @@ def cmd_generate(args):
             return 1
 
         generator = ArtifactoryTerraformGenerator(client)
-        tf_config = generator.generate_all_repositories()
 
         if args.output:
             output_path = Path(args.output)
-            output_path.write_text(tf_config)
+            with open(output_path, 'w', encoding='utf-8') as f:
+                generator.generate_all_repositories(f)
             print(f"✓ Generated Terraform configuration: {output_path}")
         else:
-            print(tf_config)
+            generator.generate_all_repositories(sys.stdout)
 
         return 0
 
@@ -12,6 +12,8 @@ This script:
 Prerequisites:
     - Azure CLI installed and logged in (az login)
     - For Azure Government: az cloud set --name AzureUSGovernment
+    - Optional, faster queries: pip install azure-identity azure-mgmt-resource
+    - Optional, faster JSON handling: pip install orjson
 
 Usage:
     python az_discover.py                      # Discover and show inventory
@@ -22,36 +24,173 @@ Usage:
 Cross-platform: Works on Windows and Linux
 """
 
+import io
 import json
+import atexit
+import logging
 import subprocess
 import sys
 import argparse
 import re
+import threading
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache, partial
+from typing import Optional, Sequence
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    from azure.core.exceptions import AzureError
+    from azure.identity import DefaultAzureCredential
+    from azure.mgmt.resource import ResourceManagementClient, SubscriptionClient
+    HAS_AZURE_SDK = True
+except ImportError:
+    HAS_AZURE_SDK = False
+
+
+# Folder name sanitization patterns
+_NON_WORD_RE = re.compile(r'[^\w\-]')
+_DASHES_RE = re.compile(r'-+')
+
+# Resource fields needed to build per-RG type counts
+RESOURCE_COUNT_FIELDS = ('type',)
+
+# Max concurrent 'az resource list' calls per subscription (ARM throttling)
+RG_DISCOVERY_WORKERS = 8
+
+# Progress output from discovery workers; configured by setup_progress_logging()
+logger = logging.getLogger('discover')
+
+
+def _progress(message: str) -> None:
+    """
+    Report discovery progress through the logger once logging is set up.
+
+    Library callers that never configure logging would otherwise lose the
+    line entirely (the last-resort handler only shows warnings), so fall
+    back to print until some handler exists.
+    """
+    if logger.hasHandlers():
+        logger.info(message)
+    else:
+        print(message)
+
+
+def setup_progress_logging() -> logging.Handler:
+    """
+    Route discovery progress through one block-buffered stdout handler.
+
+    Worker threads share the handler's lock instead of each flushing a
+    line-buffered TTY. Call handler.flush() at phase boundaries, and flush
+    sys.stdout before a phase starts, so progress stays ordered with print().
+    """
+    buffer = getattr(sys.stdout, 'buffer', None)
+    if buffer is not None:
+        stream = io.TextIOWrapper(buffer, encoding=sys.stdout.encoding,
+                                  errors='replace', write_through=False)
+        # Detach on exit so closing the wrapper never closes sys.stdout
+        atexit.register(stream.detach)
+    else:
+        stream = sys.stdout
+
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return handler
+
+
+# =============================================================================
+# AZURE SDK SESSION
+# =============================================================================
+
+# Resource Manager endpoints by 'az cloud show' name
+ARM_ENDPOINTS = {
+    'AzureCloud': 'https://management.azure.com',
+    'AzureUSGovernment': 'https://management.usgovcloudapi.net',
+    'AzureChinaCloud': 'https://management.chinacloudapi.cn',
+}
+
+_sdk_lock = threading.Lock()
+_sdk_session: Optional[dict] = None
+_rm_clients: dict = {}  # subscription_id -> ResourceManagementClient
+
+
+def get_sdk_session() -> dict:
+    """
+    Get the shared Azure SDK credential and Resource Manager endpoint.
+
+    The credential is created once and reused by every SDK client so the
+    authenticated HTTPS session and token cache are shared across calls.
+    """
+    global _sdk_session
+
+    with _sdk_lock:
+        if _sdk_session is None:
+            base_url = ARM_ENDPOINTS.get(get_current_cloud(), ARM_ENDPOINTS['AzureCloud'])
+            _sdk_session = {
+                'credential': DefaultAzureCredential(),
+                'base_url': base_url,
+                'credential_scopes': [f"{base_url}/.default"],
+            }
+        return _sdk_session
+
+
+def get_resource_client(subscription_id: str) -> 'ResourceManagementClient':
+    """Get a cached ResourceManagementClient for a subscription."""
+    session = get_sdk_session()
+
+    with _sdk_lock:
+        client = _rm_clients.get(subscription_id)
+        if client is None:
+            client = ResourceManagementClient(
+                session['credential'],
+                subscription_id,
+                base_url=session['base_url'],
+                credential_scopes=session['credential_scopes'],
+            )
+            _rm_clients[subscription_id] = client
+        return client
+
+
+def subscription_to_dict(sub) -> dict:
+    """Convert an SDK Subscription into the 'az account list' JSON shape."""
+    return {
+        'id': sub.subscription_id,
+        'name': sub.display_name,
+        'state': getattr(sub.state, 'value', sub.state),
+        'tenantId': sub.tenant_id,
+    }
+
 
 def run_az_command(args: list, timeout: int = 60) -> dict:
     """Run an Azure CLI command and return JSON output."""
     cmd = ['az'] + args + ['--output', 'json']
     
     try:
+        # Keep stdout as bytes: large listings are parsed without a str decode pass
         result = subprocess.run(
             cmd,
             capture_output=True,
-            text=True,
             timeout=timeout,
             shell=(sys.platform == 'win32')  # shell=True needed on Windows for az.cmd
         )
         
         if result.returncode != 0:
-            error_msg = result.stderr.strip() if result.stderr else 'Unknown error'
+            error_msg = result.stderr.decode('utf-8', errors='replace').strip() if result.stderr else 'Unknown error'
             return {'error': error_msg, 'success': False}
         
         if result.stdout.strip():
-            return {'data': json.loads(result.stdout), 'success': True}
+            data = orjson.loads(result.stdout) if HAS_ORJSON else json.loads(result.stdout)
+            return {'data': data, 'success': True}
         return {'data': [], 'success': True}
         
     except subprocess.TimeoutExpired:
@@ -62,8 +201,14 @@ def run_az_command(args: list, timeout: int = 60) -> dict:
         return {'error': 'Azure CLI not found. Install from https://aka.ms/installazurecli', 'success': False}
 
 
+@lru_cache(maxsize=1)
 def get_current_cloud() -> str:
-    """Get the current Azure cloud environment."""
+    """
+    Get the current Azure cloud environment.
+
+    Memoized for the process lifetime; use get_current_cloud.cache_clear()
+    after switching clouds with 'az cloud set'.
+    """
     result = run_az_command(['cloud', 'show'])
     if result['success']:
         return result['data'].get('name', 'Unknown')
@@ -72,24 +217,44 @@ def get_current_cloud() -> str:
 
 def get_subscriptions(name_filter: Optional[str] = None) -> list:
     """Get list of subscriptions."""
-    result = run_az_command(['account', 'list', '--all'])
-    
-    if not result['success']:
-        print(f"Error getting subscriptions: {result['error']}")
-        return []
-    
-    subs = result['data']
+    if HAS_AZURE_SDK:
+        session = get_sdk_session()
+        try:
+            sub_client = SubscriptionClient(
+                session['credential'],
+                base_url=session['base_url'],
+                credential_scopes=session['credential_scopes'],
+            )
+            subs = [subscription_to_dict(s) for s in sub_client.subscriptions.list()]
+        except AzureError as e:
+            print(f"Error getting subscriptions: {e}")
+            return []
+    else:
+        result = run_az_command(['account', 'list', '--all'])
+        
+        if not result['success']:
+            print(f"Error getting subscriptions: {result['error']}")
+            return []
+        
+        subs = result['data']
     
     # Apply filter if provided
     if name_filter:
-        pattern = name_filter.replace('*', '.*')
-        subs = [s for s in subs if re.match(pattern, s.get('name', ''), re.IGNORECASE)]
+        pattern = re.compile(name_filter.replace('*', '.*'), re.IGNORECASE)
+        subs = [s for s in subs if pattern.match(s.get('name', ''))]
     
     return subs
 
 
 def get_resource_groups(subscription_id: str) -> list:
     """Get resource groups for a subscription."""
+    if HAS_AZURE_SDK:
+        try:
+            client = get_resource_client(subscription_id)
+            return [rg.as_dict() for rg in client.resource_groups.list()]
+        except AzureError:
+            return []
+    
     result = run_az_command([
         'group', 'list',
         '--subscription', subscription_id
@@ -101,13 +266,36 @@ def get_resource_groups(subscription_id: str) -> list:
     return result['data']
 
 
-def get_resources_in_rg(subscription_id: str, rg_name: str) -> list:
-    """Get resources in a resource group."""
-    result = run_az_command([
+def get_resources_in_rg(subscription_id: str, rg_name: str,
+                        projection: Optional[Sequence[str]] = None) -> list:
+    """
+    Get resources in a resource group.
+
+    projection: Optional resource fields to return (e.g. ('type',)). With the
+        CLI the projection is applied server-side via --query, so only those
+        fields are serialized and parsed. None returns full resource objects.
+    """
+    if HAS_AZURE_SDK:
+        try:
+            client = get_resource_client(subscription_id)
+            resources = client.resources.list_by_resource_group(rg_name)
+            if projection:
+                return [{field: getattr(r, field, None) for field in projection} for r in resources]
+            return [r.as_dict() for r in resources]
+        except AzureError:
+            return []
+    
+    args = [
         'resource', 'list',
         '--subscription', subscription_id,
         '--resource-group', rg_name
-    ], timeout=120)
+    ]
+    
+    if projection:
+        # JMESPath multiselect hash, e.g. [].{type:type}
+        args.extend(['--query', '[].{' + ', '.join(f'{f}:{f}' for f in projection) + '}'])
+    
+    result = run_az_command(args, timeout=120)
     
     if not result['success']:
         return []
@@ -117,11 +305,7 @@ def get_resources_in_rg(subscription_id: str, rg_name: str) -> list:
 
 def count_resources_by_type(resources: list) -> dict:
     """Count resources by type."""
-    counts = {}
-    for r in resources:
-        rtype = r.get('type', 'Unknown')
-        counts[rtype] = counts.get(rtype, 0) + 1
-    return counts
+    return dict(Counter(r.get('type', 'Unknown') for r in resources))
 
 
 def discover_subscription(sub: dict, include_resources: bool = False) -> dict:
@@ -129,8 +313,6 @@ def discover_subscription(sub: dict, include_resources: bool = False) -> dict:
     sub_id = sub['id']
     sub_name = sub['name']
     
-    print(f"  Discovering: {sub_name}...", end=' ', flush=True)
-    
     rgs = get_resource_groups(sub_id)
     
     sub_info = {
@@ -143,6 +325,15 @@ def discover_subscription(sub: dict, include_resources: bool = False) -> dict:
     
     total_resources = 0
     
+    # Fetch resources for all RGs concurrently; RG listings are independent
+    rg_resources = {}
+    if include_resources and rgs:
+        with ThreadPoolExecutor(max_workers=min(RG_DISCOVERY_WORKERS, len(rgs))) as executor:
+            rg_resources = dict(executor.map(
+                lambda rg: (rg['name'], get_resources_in_rg(sub_id, rg['name'], RESOURCE_COUNT_FIELDS)),
+                rgs
+            ))
+    
     for rg in rgs:
         rg_info = {
             'name': rg['name'],
@@ -152,14 +343,14 @@ def discover_subscription(sub: dict, include_resources: bool = False) -> dict:
         }
         
         if include_resources:
-            resources = get_resources_in_rg(sub_id, rg['name'])
+            resources = rg_resources[rg['name']]
             rg_info['resource_count'] = len(resources)
             rg_info['resource_types'] = count_resources_by_type(resources)
             total_resources += len(resources)
         
         sub_info['resource_groups'].append(rg_info)
     
-    print(f"{len(rgs)} RGs, {total_resources} resources")
+    _progress(f"  Discovered: {sub_name}: {len(rgs)} RGs, {total_resources} resources")
     
     return sub_info
 
@@ -173,32 +364,50 @@ def create_folder_structure(inventory: dict, base_path: Path, structure_type: st
         'hierarchical' - environments/sub-name/resource-groups/rg-name/
     """
     created_dirs = []
+    subs = inventory['subscriptions']
     
-    for sub in inventory['subscriptions']:
-        # Sanitize subscription name for folder
-        sub_folder = sanitize_name(sub['name'])
-        
-        if structure_type == 'flat':
-            sub_path = base_path / 'subscriptions' / sub_folder
-        else:
-            sub_path = base_path / 'environments' / sub_folder
-        
-        # Create subscription-level files
-        sub_path.mkdir(parents=True, exist_ok=True)
-        created_dirs.append(sub_path)
-        
-        # Create placeholder files
-        create_subscription_files(sub_path, sub, inventory['cloud'])
+    if not subs:
+        return created_dirs
+    
+    # Subscription trees are independent; build them concurrently
+    build = partial(_build_sub_tree, base_path=base_path,
+                    structure_type=structure_type, cloud=inventory['cloud'])
+    
+    with ThreadPoolExecutor(max_workers=min(16, len(subs))) as executor:
+        for dirs in executor.map(build, subs):
+            created_dirs.extend(dirs)
+    
+    return created_dirs
+
+
+def _build_sub_tree(sub: dict, base_path: Path, structure_type: str, cloud: str) -> list:
+    """Create the folder tree and starter files for one subscription."""
+    created_dirs = []
+    
+    # Sanitize subscription name for folder
+    sub_folder = sanitize_name(sub['name'])
+    
+    if structure_type == 'flat':
+        sub_path = base_path / 'subscriptions' / sub_folder
+    else:
+        sub_path = base_path / 'environments' / sub_folder
+    
+    # Create subscription-level files
+    sub_path.mkdir(parents=True, exist_ok=True)
+    created_dirs.append(sub_path)
+    
+    # Create placeholder files
+    create_subscription_files(sub_path, sub, cloud)
+    
+    # Create RG folders
+    for rg in sub['resource_groups']:
+        rg_folder = sanitize_name(rg['name'])
+        rg_path = sub_path / rg_folder
+        rg_path.mkdir(parents=True, exist_ok=True)
+        created_dirs.append(rg_path)
         
-        # Create RG folders
-        for rg in sub['resource_groups']:
-            rg_folder = sanitize_name(rg['name'])
-            rg_path = sub_path / rg_folder
-            rg_path.mkdir(parents=True, exist_ok=True)
-            created_dirs.append(rg_path)
-            
-            # Create placeholder for RG
-            create_rg_readme(rg_path, rg, sub)
+        # Create placeholder for RG
+        create_rg_readme(rg_path, rg, sub)
     
     return created_dirs
 
@@ -206,9 +415,9 @@ def create_folder_structure(inventory: dict, base_path: Path, structure_type: st
 def sanitize_name(name: str) -> str:
     """Sanitize a name for use as a folder name."""
     # Replace spaces and special chars with hyphens
-    sanitized = re.sub(r'[^\w\-]', '-', name.lower())
+    sanitized = _NON_WORD_RE.sub('-', name.lower())
     # Remove consecutive hyphens
-    sanitized = re.sub(r'-+', '-', sanitized)
+    sanitized = _DASHES_RE.sub('-', sanitized)
     # Remove leading/trailing hyphens
     return sanitized.strip('-')
 
@@ -234,7 +443,7 @@ def create_subscription_files(path: Path, sub: dict, cloud: str):
 #   }}
 # }}
 '''
-    (path / 'backend.tf').write_text(backend_content)
+    (path / 'backend.tf').write_bytes(backend_content.encode('utf-8'))
     
     # providers.tf
     providers_content = f'''# Provider configuration for {sub['name']}
@@ -255,10 +464,10 @@ provider "azurerm" {{
   subscription_id = "{sub['id']}"
 }}
 '''
-    (path / 'providers.tf').write_text(providers_content)
+    (path / 'providers.tf').write_bytes(providers_content.encode('utf-8'))
     
     # README.md
-    readme_content = f'''# {sub['name']}
+    header = f'''# {sub['name']}
 
 **Subscription ID:** `{sub['id']}`  
 **State:** {sub.get('state', 'Unknown')}  
@@ -269,10 +478,12 @@ provider "azurerm" {{
 | Name | Location | Resources |
 |------|----------|-----------|
 '''
-    for rg in sub['resource_groups']:
-        readme_content += f"| {rg['name']} | {rg['location']} | {rg.get('resource_count', '?')} |\n"
+    rows = [
+        f"| {rg['name']} | {rg['location']} | {rg.get('resource_count', '?')} |\n"
+        for rg in sub['resource_groups']
+    ]
     
-    readme_content += '''
+    footer = '''
 ## Import Progress
 
 - [ ] aztfexport completed
@@ -280,12 +491,13 @@ provider "azurerm" {{
 - [ ] terraform plan clean
 - [ ] Code review done
 '''
-    (path / 'README.md').write_text(readme_content)
+    readme_content = header + ''.join(rows) + footer
+    (path / 'README.md').write_bytes(readme_content.encode('utf-8'))
 
 
 def create_rg_readme(path: Path, rg: dict, sub: dict):
     """Create a README for a resource group folder."""
-    content = f'''# {rg['name']}
+    header = f'''# {rg['name']}
 
 **Subscription:** {sub['name']}  
 **Location:** {rg['location']}  
@@ -295,12 +507,11 @@ def create_rg_readme(path: Path, rg: dict, sub: dict):
 
 '''
     if rg.get('resource_types'):
-        for rtype, count in sorted(rg['resource_types'].items()):
-            content += f"- {rtype}: {count}\n"
+        type_lines = [f"- {rtype}: {count}\n" for rtype, count in sorted(rg['resource_types'].items())]
     else:
-        content += "_Run discovery with --include-resources to see resource types_\n"
+        type_lines = ["_Run discovery with --include-resources to see resource types_\n"]
     
-    content += '''
+    footer = '''
 ## Import Instructions
 
 ```bash
@@ -326,13 +537,17 @@ terraform plan
 - [ ] Reviewed
 '''.format(path=path, rg_name=rg['name'])
     
-    (path / 'README.md').write_text(content)
+    content = header + ''.join(type_lines) + footer
+    (path / 'README.md').write_bytes(content.encode('utf-8'))
 
 
 def save_inventory(inventory: dict, output_path: Path):
     """Save inventory to JSON file."""
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(inventory, f, indent=2)
+    if HAS_ORJSON:
+        output_path.write_bytes(orjson.dumps(inventory, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(inventory, f, indent=2)
     print(f"\nInventory saved to: {output_path}")
 
 
@@ -391,6 +606,8 @@ Examples:
     
     args = parser.parse_args()
     
+    progress_handler = setup_progress_logging()
+    
     # Check Azure CLI login
     print("Checking Azure CLI authentication...")
     cloud = get_current_cloud()
@@ -410,7 +627,14 @@ Examples:
         print("No subscriptions found.")
         sys.exit(1)
     
-    print(f"Found {len(subs)} subscriptions")
+    # Drop disabled subscriptions before scheduling any discovery work
+    disabled = [sub for sub in subs if sub.get('state') != 'Enabled']
+    subs = [sub for sub in subs if sub.get('state') == 'Enabled']
+    
+    for sub in disabled:
+        print(f"  Skipping disabled subscription: {sub['name']}")
+    
+    print(f"Found {len(subs)} enabled subscriptions ({len(disabled)} disabled skipped)")
     
     # Discover each subscription
     print("\nDiscovering resource groups...")
@@ -421,14 +645,20 @@ Examples:
         'subscriptions': []
     }
     
-    # Sequential discovery (parallel can hit rate limits)
-    for sub in subs:
-        if sub.get('state') != 'Enabled':
-            print(f"  Skipping disabled subscription: {sub['name']}")
-            continue
-        
-        sub_info = discover_subscription(sub, include_resources=args.include_resources)
-        inventory['subscriptions'].append(sub_info)
+    # Parallel discovery, bounded by --parallel to stay under ARM rate limits
+    sys.stdout.flush()
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, args.parallel)) as executor:
+        futures = {
+            executor.submit(discover_subscription, sub, args.include_resources): sub
+            for sub in subs
+        }
+        for future in as_completed(futures):
+            results[futures[future]['id']] = future.result()
+    
+    # Keep inventory order stable regardless of completion order
+    inventory['subscriptions'] = [results[sub['id']] for sub in subs]
+    progress_handler.flush()
     
     # Print summary
     print_summary(inventory)
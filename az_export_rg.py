@@ -24,10 +24,10 @@ Cross-platform: Works on Windows and Linux
 import os
 import sys
 import argparse
+import mmap
 import subprocess
-import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
 
 
 def get_script_dir() -> Path:
@@ -43,7 +43,7 @@ def check_prerequisites() -> dict:
         'terraform': False,
     }
     
-    for tool in checks:
+    def _check(tool: str) -> bool:
         try:
             result = subprocess.run(
                 [tool, '--version'],
@@ -51,9 +51,15 @@ def check_prerequisites() -> dict:
                 text=True,
                 shell=(sys.platform == 'win32')
             )
-            checks[tool] = result.returncode == 0
+            return result.returncode == 0
         except FileNotFoundError:
-            checks[tool] = False
+            return False
+    
+    # Version checks are independent child processes; run them side by side
+    tools = list(checks)
+    with ThreadPoolExecutor(max_workers=len(tools)) as executor:
+        for tool, ok in zip(tools, executor.map(_check, tools)):
+            checks[tool] = ok
     
     return checks
 
@@ -101,6 +107,8 @@ def run_aztfexport(
     
     print(f"\nRunning: {' '.join(cmd)}")
     print("-" * 60)
+    # Child writes straight to our fds; flush so the header lands first
+    sys.stdout.flush()
     
     try:
         result = subprocess.run(
@@ -115,12 +123,43 @@ def run_aztfexport(
         return False
 
 
+def _clone_tree(src: Path, dst: Path):
+    """
+    Copy a directory tree, sharing data blocks where the filesystem allows.
+
+    GNU cp --reflink=auto makes copy-on-write clones on btrfs/xfs and falls
+    back to a normal copy elsewhere. Hardlinks are deliberately not used:
+    the backup must survive later in-place edits (terraform fmt, hand fixes)
+    of the exported files.
+    """
+    if sys.platform.startswith('linux'):
+        try:
+            result = subprocess.run(
+                ['cp', '-a', '--reflink=auto', str(src), str(dst)],
+                capture_output=True,
+            )
+            if result.returncode == 0:
+                return
+        except FileNotFoundError:
+            pass
+    
+    import shutil
+    
+    # Don't let a partial clone break copytree
+    if dst.exists():
+        shutil.rmtree(dst, ignore_errors=True)
+    
+    shutil.copytree(src, dst)
+
+
 def backup_raw_output(output_dir: Path) -> Path:
     """Create a backup of the raw aztfexport output."""
+    from datetime import datetime
+    
     backup_dir = output_dir.parent / f"{output_dir.name}_raw_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     
     if output_dir.exists():
-        shutil.copytree(output_dir, backup_dir)
+        _clone_tree(output_dir, backup_dir)
         print(f"Backed up raw output to: {backup_dir}")
     
     return backup_dir
@@ -143,18 +182,38 @@ def run_splitter(input_file: Path, output_dir: Path, config_path: Path = None) -
     
     print(f"\nOrganizing output with tf_splitter...")
     print("-" * 60)
+    sys.stdout.flush()
     
     result = subprocess.run(cmd)
     return result.returncode == 0
 
 
+def count_in_file(path: str, needle: bytes) -> int:
+    """Count non-overlapping occurrences of needle in a file without decoding it."""
+    with open(path, 'rb') as f:
+        # mmap rejects zero-length files
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            count = 0
+            pos = mm.find(needle)
+            while pos != -1:
+                count += 1
+                pos = mm.find(needle, pos + len(needle))
+            return count
+
+
 def create_post_export_report(output_dir: Path, resource_group: str, subscription_id: str):
     """Create a report of what was exported and next steps."""
+    from datetime import datetime
     
-    # Count files and blocks
-    tf_files = list(output_dir.glob('*.tf'))
+    # Count files and blocks (DirEntry carries its stat, no per-file lookups)
+    with os.scandir(output_dir) as it:
+        tf_entries = [e for e in it
+                      if e.name.endswith('.tf') and not e.name.startswith('.') and e.is_file()]
+    tf_entries.sort(key=lambda e: e.name)
     
-    report = f'''# Export Report: {resource_group}
+    parts = [f'''# Export Report: {resource_group}
 
 **Exported:** {datetime.now().isoformat()}  
 **Subscription:** `{subscription_id}`  
@@ -162,15 +221,14 @@ def create_post_export_report(output_dir: Path, resource_group: str, subscriptio
 
 ## Generated Files
 
-'''
+''']
     
-    for tf_file in sorted(tf_files):
+    for entry in tf_entries:
         # Count resource blocks in file
-        content = tf_file.read_text(encoding='utf-8')
-        resource_count = content.count('resource "')
-        report += f"- `{tf_file.name}`: {resource_count} resources\n"
+        resource_count = count_in_file(entry.path, b'resource "')
+        parts.append(f"- `{entry.name}`: {resource_count} resources\n")
     
-    report += '''
+    parts.append('''
 ## Next Steps
 
 1. **Review the generated code:**
@@ -203,7 +261,8 @@ def create_post_export_report(output_dir: Path, resource_group: str, subscriptio
 - `compute-extensions.tf` - VM extensions often have drift
 - `identity.tf` - Role assignments may reference users/groups
 
-'''
+''')
+    report = ''.join(parts)
     
     report_path = output_dir / 'EXPORT_REPORT.md'
     report_path.write_text(report)
@@ -13,17 +13,36 @@ Usage:
     azurerm_version = get_provider_version('azurerm')
 """
 
+import copy
+import hashlib
+import importlib.util
+import marshal
 import os
 import sys
+import tempfile
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 
-try:
-    import yaml
-    HAS_YAML = True
-except ImportError:
-    HAS_YAML = False
-    print("Warning: PyYAML not installed. Using default configuration.")
+# PyYAML is imported on the first config parse (see _load_yaml_module), so
+# importers that only need defaults or a cached config never pay for it.
+# find_spec only locates the package, so HAS_YAML is still known at import.
+HAS_YAML = importlib.util.find_spec('yaml') is not None
+yaml = None
+_YAML_LOADER = None
+
+
+def _load_yaml_module() -> bool:
+    """Import PyYAML on first use and report whether it is available."""
+    global yaml, _YAML_LOADER
+
+    if HAS_YAML and yaml is None:
+        import yaml as _yaml
+        yaml = _yaml
+        # libyaml-backed loader is several times faster when PyYAML was built with it
+        _YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+    return HAS_YAML
 
 
 # =============================================================================
@@ -117,6 +136,11 @@ DEFAULT_CONFIG = {
 
 _config_cache: Optional[Dict[str, Any]] = None
 
+# Parsed YAML is cached per config file in a private temp dir, keyed by
+# (mtime_ns, size). marshal only round-trips plain data (dicts, lists,
+# strings, numbers), so loading a cache never runs code.
+CONFIG_CACHE_DIR = Path(tempfile.gettempdir()) / "tf_migration_config_cache"
+
 
 def get_config_path() -> Path:
     """Get the path to config.yaml."""
@@ -144,37 +168,106 @@ def load_config(config_path: Optional[Path] = None) -> Dict[str, Any]:
     if config_path is None:
         config_path = get_config_path()
 
-    if HAS_YAML and config_path.exists():
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
-                # Merge with defaults to ensure all keys exist
-                return merge_configs(DEFAULT_CONFIG, config)
-        except Exception as e:
-            print(f"Warning: Failed to load config from {config_path}: {e}")
-            print("Using default configuration.")
-            return DEFAULT_CONFIG
-    else:
-        if not HAS_YAML:
-            print("PyYAML not available. Install with: pip install pyyaml")
-        elif not config_path.exists():
-            print(f"Config file not found: {config_path}")
+    if not config_path.exists():
+        print(f"Config file not found: {config_path}")
         print("Using default configuration.")
         return DEFAULT_CONFIG
 
+    try:
+        config = _load_yaml_cached(config_path)
+        # Merge with defaults to ensure all keys exist
+        return merge_configs(DEFAULT_CONFIG, config)
+    except ImportError:
+        print("PyYAML not available. Install with: pip install pyyaml")
+        print("Using default configuration.")
+        return DEFAULT_CONFIG
+    except Exception as e:
+        print(f"Warning: Failed to load config from {config_path}: {e}")
+        print("Using default configuration.")
+        return DEFAULT_CONFIG
+
+
+def _config_cache_dir_usable() -> bool:
+    """
+    Create the config cache directory if needed and check that it is ours.
+
+    The directory lives in the shared temp dir, so only trust one owned by
+    this user that others cannot write to; anyone else could plant config.
+    """
+    try:
+        CONFIG_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if hasattr(os, 'getuid'):
+            st = CONFIG_CACHE_DIR.stat()
+            if st.st_uid != os.getuid() or st.st_mode & 0o022:
+                return False
+    except OSError:
+        return False
+    return True
+
+
+def _load_yaml_cached(config_path: Path) -> Dict[str, Any]:
+    """
+    Parse a YAML config file, reusing the cached result while the file is unchanged.
+
+    The cache is best-effort: a stale, corrupt, unusable or unwritable cache
+    just means the YAML is parsed again. PyYAML is only imported on a cache
+    miss; raises ImportError if it is needed but not installed.
+    """
+    stat = config_path.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    cache_path = None
+
+    if _config_cache_dir_usable():
+        name = hashlib.sha256(os.fsencode(config_path.resolve())).hexdigest()
+        cache_path = CONFIG_CACHE_DIR / f"{name}.marshal"
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_key, config = marshal.load(f)
+            if cached_key == key:
+                return config
+        except Exception:
+            pass
+
+    if not _load_yaml_module():
+        raise ImportError("PyYAML not installed")
+
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = yaml.load(f, Loader=_YAML_LOADER)
+
+    if cache_path is None:
+        return config
+
+    # Write to a temp file and rename so readers never see a partial cache.
+    # Values marshal can't hold (e.g. YAML timestamps) just skip caching.
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            marshal.dump((key, config), f)
+        os.replace(tmp_path, cache_path)
+    except (OSError, ValueError):
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+    return config
+
 
 def merge_configs(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Recursively merge two configuration dictionaries.
-    Values in 'override' take precedence over 'base'.
+    Deep-merge two configuration dictionaries.
+    Values in 'override' take precedence over 'base'; neither input is modified.
     """
-    result = base.copy()
+    result = copy.deepcopy(base)
+    stack = [(result, override)]
 
-    for key, value in override.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = merge_configs(result[key], value)
-        else:
-            result[key] = value
+    while stack:
+        dst, src = stack.pop()
+        for key, value in src.items():
+            if isinstance(value, dict) and isinstance(dst.get(key), dict):
+                stack.append((dst[key], value))
+            else:
+                dst[key] = value
 
     return result
 
@@ -193,6 +286,7 @@ def get_config(reload: bool = False) -> Dict[str, Any]:
 
     if _config_cache is None or reload:
         _config_cache = load_config()
+        clear_caches()
 
     return _config_cache
 
@@ -200,13 +294,16 @@ def get_config(reload: bool = False) -> Dict[str, Any]:
 # =============================================================================
 # CONVENIENCE FUNCTIONS
 # =============================================================================
+# Accessors are memoized; get_config(reload=True) clears them via clear_caches().
 
+@lru_cache(maxsize=None)
 def get_backend_config() -> Dict[str, str]:
     """Get backend configuration for Azure storage."""
     config = get_config()
     return config.get('backend', {})
 
 
+@lru_cache(maxsize=None)
 def get_provider_version(provider: str) -> str:
     """
     Get version constraint for a provider.
@@ -226,6 +323,7 @@ def get_provider_version(provider: str) -> str:
     return '~> 1.0'
 
 
+@lru_cache(maxsize=None)
 def get_provider_source(provider: str) -> str:
     """
     Get source for a provider.
@@ -245,24 +343,28 @@ def get_provider_source(provider: str) -> str:
     return f'hashicorp/{provider}'
 
 
+@lru_cache(maxsize=None)
 def get_terraform_version() -> str:
     """Get required Terraform version constraint."""
     config = get_config()
     return config.get('terraform', {}).get('required_version', '>= 1.5.0')
 
 
+@lru_cache(maxsize=1)
 def get_artifactory_config() -> Dict[str, Any]:
-    """Get Artifactory configuration."""
+    """Get Artifactory configuration (cached until get_config(reload=True))."""
     config = get_config()
     return config.get('artifactory', {})
 
 
+@lru_cache(maxsize=None)
 def get_catalog_output_keys() -> list:
     """Get list of output keys for catalog generation."""
     config = get_config()
     return config.get('catalog', {}).get('output_keys', [])
 
 
+@lru_cache(maxsize=None)
 def is_azure_government() -> bool:
     """Check if configured for Azure Government."""
     backend = get_backend_config()
@@ -270,6 +372,10 @@ def is_azure_government() -> bool:
     return env in ['usgovernment', 'government', 'gov']
 
 
+# "<prefix>/%s/%s.tfstate", built on first use and reset by clear_caches()
+_STATE_KEY_FMT: Optional[str] = None
+
+
 def get_state_key(subscription: str, component: str) -> str:
     """
     Generate a state key based on naming convention.
@@ -281,9 +387,31 @@ def get_state_key(subscription: str, component: str) -> str:
     Returns:
         State key path (e.g., 'legacy/sub-prod/rg-network.tfstate')
     """
-    backend = get_backend_config()
-    prefix = backend.get('state_key_prefix', 'legacy')
-    return f"{prefix}/{subscription}/{component}.tfstate"
+    global _STATE_KEY_FMT
+
+    if _STATE_KEY_FMT is None:
+        prefix = get_backend_config().get('state_key_prefix', 'legacy')
+        # Escape '%' so a literal percent in the prefix survives formatting
+        _STATE_KEY_FMT = prefix.replace('%', '%%') + "/%s/%s.tfstate"
+
+    return _STATE_KEY_FMT % (subscription, component)
+
+
+def clear_caches() -> None:
+    """Drop memoized accessor results so they re-read the current config."""
+    global _STATE_KEY_FMT
+
+    _STATE_KEY_FMT = None
+    for accessor in (
+        get_backend_config,
+        get_provider_version,
+        get_provider_source,
+        get_terraform_version,
+        get_artifactory_config,
+        get_catalog_output_keys,
+        is_azure_government,
+    ):
+        accessor.cache_clear()
 
 
 # =============================================================================
@@ -19,87 +19,246 @@ Usage:
 
 Prerequisites:
     - graphviz (optional, for rendering): pip install graphviz
+    - python-hcl2 (optional, real HCL parsing): pip install python-hcl2
 """
 
 import argparse
+import importlib.util
+import os
 import re
 import sys
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 
 try:
-    import graphviz
-    HAS_GRAPHVIZ = True
+    import hcl2
+    HAS_HCL2 = True
 except ImportError:
-    HAS_GRAPHVIZ = False
+    HAS_HCL2 = False
+
+# graphviz is only imported for --render; find_spec just checks it's installed
+HAS_GRAPHVIZ = importlib.util.find_spec('graphviz') is not None
 
 
 # =============================================================================
 # TERRAFORM PARSER
 # =============================================================================
 
+# Resource blocks: resource "type" "name" { body } (one level of nested braces).
+# Matched on raw bytes so .tf files are never decoded as a whole.
+_RESOURCE_RE = re.compile(
+    rb'resource\s+"([^"]+)"\s+"([^"]+)"\s*\{([^}]*(?:\{[^}]*\}[^}]*)*)\}',
+    re.MULTILINE | re.DOTALL
+)
+
+# References: azurerm_resource.name or azurerm_resource.name.attribute
+# (str form for python-hcl2 string leaves, bytes form for regex-parsed bodies)
+_REF_RE = re.compile(r'\b([a-z_]+)\.([a-z0-9_-]+)(?:\.([a-z_]+))?')
+_REF_BYTES_RE = re.compile(_REF_RE.pattern.encode('ascii'))
+
+# Reference prefixes that are never managed resources
+_NON_RESOURCE_PREFIXES = frozenset(['var', 'local', 'data', 'module', 'each', 'count'])
+
+# Below this much .tf input, worker spawn and result pickling cost more than
+# the regex parse itself (tens of MB/s), so files are parsed in-process
+_PARALLEL_PARSE_MIN_BYTES = 4 << 20
+
+
+def _iter_strings(value):
+    """Yield every string leaf of a parsed HCL value (dicts, lists, scalars)."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _iter_strings(item)
+
+
+def _scan_refs(body) -> Set[str]:
+    """Collect candidate resource references (type.name) from a resource body.
+
+    body is a parsed python-hcl2 value or the raw bytes of a regex match.
+    """
+    if isinstance(body, bytes):
+        matches = ((m.group(1).decode('ascii'), m.group(2).decode('ascii'))
+                   for m in _REF_BYTES_RE.finditer(body))
+    else:
+        matches = ((m.group(1), m.group(2))
+                   for text in _iter_strings(body)
+                   for m in _REF_RE.finditer(text))
+
+    refs = set()
+    for ref_type, ref_name in matches:
+        # Skip common keywords that aren't resources
+        if ref_type in _NON_RESOURCE_PREFIXES:
+            continue
+
+        refs.add(f"{ref_type}.{ref_name}")
+    return refs
+
+
+def _parse_tf_file_hcl2(tf_file: str) -> Optional[Dict[str, Set[str]]]:
+    """Parse a .tf file with python-hcl2; return None to fall back to regex."""
+    try:
+        with open(tf_file, 'r', encoding='utf-8') as f:
+            parsed = hcl2.load(f)
+    except Exception:
+        return None
+
+    # Newer python-hcl2 releases keep the quotes around block labels
+    resources = {}
+    for block in parsed.get('resource', []):
+        for resource_type, named in block.items():
+            resource_type = resource_type.strip('"')
+            for resource_name, body in named.items():
+                resource_name = resource_name.strip('"')
+                resources[f"{resource_type}.{resource_name}"] = _scan_refs(body)
+    return resources
+
+
+def _parse_tf_file(tf_file: str) -> Dict[str, Set[str]]:
+    """Parse a single .tf file into {resource_id: candidate refs}.
+
+    Bodies are scanned as they are matched and then dropped, so only the
+    reference names outlive the file. Top-level so it can be shipped to
+    worker processes.
+    """
+    if HAS_HCL2:
+        resources = _parse_tf_file_hcl2(tf_file)
+        if resources is not None:
+            return resources
+
+    with open(tf_file, 'rb') as f:
+        content = f.read()
+
+    resources = {}
+    for match in _RESOURCE_RE.finditer(content):
+        resource_type = match.group(1).decode('utf-8')
+        resource_name = match.group(2).decode('utf-8')
+        resource_body = match.group(3)
+
+        resource_id = f"{resource_type}.{resource_name}"
+        resources[resource_id] = _scan_refs(resource_body)
+    return resources
+
+
+def _list_tf_files(directory: str) -> List[str]:
+    """
+    List .tf file paths in a directory as plain strings.
+
+    Hidden files are skipped, as glob('*.tf') would. Paths stay str from
+    here on: they are what worker processes receive, and they skip the
+    per-file pathlib object overhead.
+    """
+    with os.scandir(directory) as it:
+        return [e.path for e in it
+                if e.name.endswith('.tf') and not e.name.startswith('.') and e.is_file()]
+
+
+def _total_size(paths: Sequence[str]) -> int:
+    """Combined size of the given files in bytes (missing files count as 0)."""
+    total = 0
+    for path in paths:
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            pass
+    return total
+
+
+def _get_max_workers() -> int:
+    """Worker count for file parsing: one per CPU.
+
+    Loading config.yaml here would print its status messages to stdout,
+    which is where the graph itself goes.
+    """
+    return os.cpu_count() or 1
+
+
 class TerraformDependencyParser:
     """Parse Terraform files to extract resource dependencies."""
 
     def __init__(self, directory: Path):
         self.directory = directory
-        self.resources = {}  # resource_type.name -> attributes
+        self.resources = {}  # resource_type.name -> None (bodies are not kept)
         self.dependencies = defaultdict(set)  # resource -> set of dependencies
+        self._pending_refs = {}  # resource_type.name -> candidate refs
+
+    def parse(self, tf_files: Optional[Sequence[str]] = None):
+        """Parse all .tf files in the directory (or the given file paths)."""
+        if tf_files is None:
+            tf_files = _list_tf_files(os.fspath(self.directory))
+        max_workers = min(_get_max_workers(), len(tf_files))
+
+        # Worker startup outweighs the regex work for a typical RG folder
+        if max_workers > 1 and _total_size(tf_files) >= _PARALLEL_PARSE_MIN_BYTES:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for result in executor.map(_parse_tf_file, tf_files):
+                    self._pending_refs.update(result)
+        else:
+            for tf_file in tf_files:
+                self._pending_refs.update(_parse_tf_file(tf_file))
+
+        self.resources = dict.fromkeys(self._pending_refs)
+        self._extract_dependencies()
 
-    def parse(self):
-        """Parse all .tf files in the directory."""
-        tf_files = list(self.directory.glob('*.tf'))
-
-        for tf_file in tf_files:
-            self._parse_file(tf_file)
+    def _extract_dependencies(self):
+        """Keep the scanned references that name known resources."""
+        self._resource_set = set(self.resources)
 
-        self._extract_dependencies()
+        for resource_id, refs in self._pending_refs.items():
+            deps = (refs & self._resource_set) - {resource_id}
+            if deps:
+                self.dependencies[resource_id].update(deps)
 
-    def _parse_file(self, tf_file: Path):
-        """Parse a single .tf file for resource definitions."""
-        content = tf_file.read_text(encoding='utf-8')
+        self._pending_refs = {}
 
-        # Find all resource blocks
-        resource_pattern = re.compile(
-            r'resource\s+"([^"]+)"\s+"([^"]+)"\s*\{([^}]*(?:\{[^}]*\}[^}]*)*)\}',
-            re.MULTILINE | re.DOTALL
-        )
 
-        for match in resource_pattern.finditer(content):
-            resource_type = match.group(1)
-            resource_name = match.group(2)
-            resource_body = match.group(3)
+def _tf_change_key(directory: str, tf_files: Tuple[str, ...]) -> Tuple[int, int]:
+    """
+    Change key for a directory's .tf files: (directory mtime, newest .tf mtime).
 
-            resource_id = f"{resource_type}.{resource_name}"
-            self.resources[resource_id] = resource_body
+    The directory mtime moves when files are added, removed or renamed; the
+    newest file mtime moves when any .tf file is edited in place.
+    """
+    newest = max((os.stat(path).st_mtime_ns for path in tf_files), default=0)
+    return os.stat(directory).st_mtime_ns, newest
 
-    def _extract_dependencies(self):
-        """Extract dependencies by analyzing resource references."""
-        for resource_id, body in self.resources.items():
-            # Find references to other resources
-            # Pattern: azurerm_resource.name or azurerm_resource.name.attribute
-            ref_pattern = re.compile(r'\b([a-z_]+)\.([a-z0-9_-]+)(?:\.([a-z_]+))?')
 
-            for match in ref_pattern.finditer(body):
-                ref_type = match.group(1)
-                ref_name = match.group(2)
+@lru_cache(maxsize=32)
+def _cached_parser(directory: str, tf_files: Tuple[str, ...],
+                   change_key: Tuple[int, int]) -> TerraformDependencyParser:
+    """Parse a directory; change_key only participates in the cache key."""
+    tf_parser = TerraformDependencyParser(Path(directory))
+    tf_parser.parse(tf_files)
+    return tf_parser
 
-                # Skip common keywords that aren't resources
-                if ref_type in ['var', 'local', 'data', 'module', 'each', 'count']:
-                    continue
 
-                ref_id = f"{ref_type}.{ref_name}"
+def get_parser(directory: Path) -> TerraformDependencyParser:
+    """
+    Return a parsed TerraformDependencyParser for a directory.
 
-                # Only add if it's a known resource
-                if ref_id in self.resources and ref_id != resource_id:
-                    self.dependencies[resource_id].add(ref_id)
+    Parsers are cached in-process and reused until a .tf file in the
+    directory changes, so emitting several formats parses only once.
+    Treat the returned parser as read-only.
+    """
+    directory = os.fspath(directory)
+    tf_files = tuple(_list_tf_files(directory))
+    return _cached_parser(directory, tf_files, _tf_change_key(directory, tf_files))
 
 
 # =============================================================================
 # GRAPH GENERATORS
 # =============================================================================
 
+# Mermaid node ids cannot contain '.' or '-'
+_MERMAID_ID_TABLE = str.maketrans({'.': '_', '-': '_'})
+
 class DotGraphGenerator:
     """Generate DOT format graph."""
 
@@ -115,25 +274,18 @@ class DotGraphGenerator:
             ''
         ]
 
-        # Group by resource type
-        type_groups = defaultdict(list)
-        for resource_id in self.parser.resources.keys():
-            resource_type = resource_id.split('.')[0]
-            type_groups[resource_type].append(resource_id)
-
         # Add nodes with colors based on type
-        colors = {
+        colors = defaultdict(lambda: 'lightgray', {
             'azurerm_virtual_network': 'lightblue',
             'azurerm_subnet': 'lightblue',
             'azurerm_network_security_group': 'orange',
             'azurerm_linux_virtual_machine': 'lightgreen',
             'azurerm_windows_virtual_machine': 'lightgreen',
             'azurerm_storage_account': 'yellow',
-        }
+        })
 
         for resource_id in self.parser.resources.keys():
-            resource_type = resource_id.split('.')[0]
-            color = colors.get(resource_type, 'lightgray')
+            color = colors[resource_id.partition('.')[0]]
             label = resource_id.replace('_', '\\n')
 
             lines.append(f'  "{resource_id}" [label="{label}", fillcolor="{color}", style="filled,rounded"];')
@@ -163,23 +315,20 @@ class MermaidGraphGenerator:
             ''
         ]
 
-        # Sanitize names for Mermaid
-        def sanitize(name: str) -> str:
-            return name.replace('.', '_').replace('-', '_')
+        # Sanitize names for Mermaid once per node
+        safe = {rid: rid.translate(_MERMAID_ID_TABLE) for rid in self.parser.resources}
 
         # Add nodes
         for resource_id in self.parser.resources.keys():
-            safe_id = sanitize(resource_id)
-            lines.append(f'  {safe_id}["{resource_id}"]')
+            lines.append(f'  {safe[resource_id]}["{resource_id}"]')
 
         lines.append('')
 
         # Add edges
         for resource_id, deps in self.parser.dependencies.items():
-            safe_source = sanitize(resource_id)
+            safe_source = safe[resource_id]
             for dep in deps:
-                safe_dep = sanitize(dep)
-                lines.append(f'  {safe_source} --> {safe_dep}')
+                lines.append(f'  {safe_source} --> {safe[dep]}')
 
         return '\n'.join(lines)
 
@@ -208,28 +357,33 @@ class TextTreeGenerator:
                 key=lambda r: len(self.parser.dependencies.get(r, set()))
             )[:3]
 
+        lines.append("Terraform Resource Dependencies:")
+        lines.append("")
+
+        # Iterative pre-order DFS; each resource is printed once, under the
+        # first parent that reaches it, which also breaks cycles
         visited = set()
+        sorted_roots = sorted(roots)
+        stack = [(root, "", i == len(sorted_roots) - 1)
+                 for i, root in enumerate(sorted_roots)]
+        stack.reverse()
 
-        def print_tree(resource_id: str, prefix: str = "", is_last: bool = True):
+        while stack:
+            resource_id, prefix, is_last = stack.pop()
             if resource_id in visited:
-                return
+                continue
 
             visited.add(resource_id)
 
             connector = "└── " if is_last else "├── "
             lines.append(f"{prefix}{connector}{resource_id}")
 
-            deps = list(self.parser.dependencies.get(resource_id, []))
-            extension = "    " if is_last else "│   "
-
-            for i, dep in enumerate(deps):
-                print_tree(dep, prefix + extension, i == len(deps) - 1)
-
-        lines.append("Terraform Resource Dependencies:")
-        lines.append("")
+            deps = sorted(self.parser.dependencies.get(resource_id, ()))
+            child_prefix = prefix + ("    " if is_last else "│   ")
 
-        for i, root in enumerate(sorted(roots)):
-            print_tree(root, "", i == len(roots) - 1)
+            # Push in reverse so the first dependency is printed first
+            for i in range(len(deps) - 1, -1, -1):
+                stack.append((deps[i], child_prefix, i == len(deps) - 1))
 
         return '\n'.join(lines)
 
@@ -295,8 +449,7 @@ Examples:
 
     # Parse Terraform files
     print(f"Parsing Terraform files in: {args.rg}", file=sys.stderr)
-    tf_parser = TerraformDependencyParser(args.rg)
-    tf_parser.parse()
+    tf_parser = get_parser(args.rg)
 
     print(f"Found {len(tf_parser.resources)} resources", file=sys.stderr)
     print(f"Found {sum(len(deps) for deps in tf_parser.dependencies.values())} dependencies", file=sys.stderr)
@@ -325,6 +478,9 @@ Examples:
             print("Install with: pip install graphviz", file=sys.stderr)
             return 1
 
+        # Imported here so the graph formats don't pay for graphviz at startup
+        import graphviz
+
         try:
             src = graphviz.Source(output)
             output_file = args.output or Path('graph.dot')
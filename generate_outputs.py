@@ -10,6 +10,7 @@ This script parses aztfexport's main.tf and generates:
 
 Usage:
     python generate_outputs.py /path/to/main.tf [--config resource_types.yaml]
+    python generate_outputs.py --batch /path/to/subscription [--jobs N]
 
 Example:
     cd /infrastructure-repo/legacy-import/sub-prod-core/rg-hub-network
@@ -22,17 +23,25 @@ Output:
 """
 
 import argparse
+import hashlib
+import io
 import os
+import pickle
 import re
 import sys
+import tempfile
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, Iterator, List, Any, Optional, Sequence, TextIO, Tuple
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 
 # Try to import yaml, fall back to embedded config if not available
 try:
     import yaml
     HAS_YAML = True
+    # libyaml-backed loader is several times faster when PyYAML was built with it
+    _YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 except ImportError:
     HAS_YAML = False
     print("Warning: PyYAML not installed. Using embedded configuration.")
@@ -40,172 +49,14 @@ except ImportError:
 
 
 # =============================================================================
-# EMBEDDED DEFAULT CONFIGURATION (used if YAML not available)
+# DATA CLASSES
 # =============================================================================
 
-DEFAULT_RESOURCE_TYPES = [
-    # Networking
-    {
-        "terraform_type": "azurerm_virtual_network",
-        "output_key": "vnets",
-        "key_attribute": "name",
-        "description": "Virtual Networks",
-        "attributes": ["id", "name", "location", "resource_group_name", "address_space"]
-    },
-    {
-        "terraform_type": "azurerm_subnet",
-        "output_key": "subnets",
-        "key_attribute": "composite",
-        "key_template": "${virtual_network_name}/${name}",
-        "description": "Subnets",
-        "attributes": ["id", "name", "virtual_network_name", "resource_group_name", "address_prefixes"]
-    },
-    {
-        "terraform_type": "azurerm_network_security_group",
-        "output_key": "nsgs",
-        "key_attribute": "name",
-        "description": "Network Security Groups",
-        "attributes": ["id", "name", "location", "resource_group_name"]
-    },
-    {
-        "terraform_type": "azurerm_network_interface",
-        "output_key": "nics",
-        "key_attribute": "name",
-        "description": "Network Interfaces",
-        "attributes": ["id", "name", "location", "resource_group_name", "private_ip_address"]
-    },
-    {
-        "terraform_type": "azurerm_public_ip",
-        "output_key": "public_ips",
-        "key_attribute": "name",
-        "description": "Public IPs",
-        "attributes": ["id", "name", "location", "resource_group_name", "ip_address"]
-    },
-    {
-        "terraform_type": "azurerm_route_table",
-        "output_key": "route_tables",
-        "key_attribute": "name",
-        "description": "Route Tables",
-        "attributes": ["id", "name", "location", "resource_group_name"]
-    },
-    {
-        "terraform_type": "azurerm_nat_gateway",
-        "output_key": "nat_gateways",
-        "key_attribute": "name",
-        "description": "NAT Gateways",
-        "attributes": ["id", "name", "location", "resource_group_name"]
-    },
-    # Compute
-    {
-        "terraform_type": "azurerm_linux_virtual_machine",
-        "output_key": "linux_vms",
-        "key_attribute": "name",
-        "description": "Linux Virtual Machines",
-        "attributes": ["id", "name", "location", "resource_group_name", "size", "private_ip_address", "admin_username"]
-    },
-    {
-        "terraform_type": "azurerm_windows_virtual_machine",
-        "output_key": "windows_vms",
-        "key_attribute": "name",
-        "description": "Windows Virtual Machines",
-        "attributes": ["id", "name", "location", "resource_group_name", "size", "private_ip_address", "admin_username"]
-    },
-    {
-        "terraform_type": "azurerm_virtual_machine",
-        "output_key": "classic_vms",
-        "key_attribute": "name",
-        "description": "Classic Virtual Machines",
-        "attributes": ["id", "name", "location", "resource_group_name"]
-    },
-    {
-        "terraform_type": "azurerm_managed_disk",
-        "output_key": "managed_disks",
-        "key_attribute": "name",
-        "description": "Managed Disks",
-        "attributes": ["id", "name", "location", "resource_group_name", "storage_account_type", "disk_size_gb"]
-    },
-    {
-        "terraform_type": "azurerm_availability_set",
-        "output_key": "availability_sets",
-        "key_attribute": "name",
-        "description": "Availability Sets",
-        "attributes": ["id", "name", "location", "resource_group_name"]
-    },
-    {
-        "terraform_type": "azurerm_virtual_machine_scale_set",
-        "output_key": "vmss",
-        "key_attribute": "name",
-        "description": "Virtual Machine Scale Sets",
-        "attributes": ["id", "name", "location", "resource_group_name"]
-    },
-    # Storage
-    {
-        "terraform_type": "azurerm_storage_account",
-        "output_key": "storage_accounts",
-        "key_attribute": "name",
-        "description": "Storage Accounts",
-        "attributes": ["id", "name", "location", "resource_group_name", "account_tier", "account_replication_type", "primary_blob_endpoint"]
-    },
-    {
-        "terraform_type": "azurerm_storage_container",
-        "output_key": "storage_containers",
-        "key_attribute": "name",
-        "description": "Storage Containers",
-        "attributes": ["id", "name", "storage_account_name"]
-    },
-    # Database
-    {
-        "terraform_type": "azurerm_mssql_server",
-        "output_key": "sql_servers",
-        "key_attribute": "name",
-        "description": "Azure SQL Servers",
-        "attributes": ["id", "name", "location", "resource_group_name", "fully_qualified_domain_name"]
-    },
-    {
-        "terraform_type": "azurerm_mssql_database",
-        "output_key": "sql_databases",
-        "key_attribute": "name",
-        "description": "Azure SQL Databases",
-        "attributes": ["id", "name", "server_id"]
-    },
-    {
-        "terraform_type": "azurerm_cosmosdb_account",
-        "output_key": "cosmosdb_accounts",
-        "key_attribute": "name",
-        "description": "Cosmos DB Accounts",
-        "attributes": ["id", "name", "location", "resource_group_name", "endpoint"]
-    },
-    # Identity & Security
-    {
-        "terraform_type": "azurerm_key_vault",
-        "output_key": "key_vaults",
-        "key_attribute": "name",
-        "description": "Key Vaults",
-        "attributes": ["id", "name", "location", "resource_group_name", "vault_uri"]
-    },
-    {
-        "terraform_type": "azurerm_user_assigned_identity",
-        "output_key": "managed_identities",
-        "key_attribute": "name",
-        "description": "User Assigned Managed Identities",
-        "attributes": ["id", "name", "location", "resource_group_name", "client_id", "principal_id"]
-    },
-    # Resource Groups
-    {
-        "terraform_type": "azurerm_resource_group",
-        "output_key": "resource_groups",
-        "key_attribute": "name",
-        "description": "Resource Groups",
-        "attributes": ["id", "name", "location"]
-    },
-]
+# __slots__ dataclasses need Python 3.10+; older interpreters get plain ones
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
 
-# =============================================================================
-# DATA CLASSES
-# =============================================================================
-
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ResourceTypeConfig:
     """Configuration for a resource type."""
     terraform_type: str
@@ -214,20 +65,286 @@ class ResourceTypeConfig:
     description: str
     attributes: List[str]
     key_template: Optional[str] = None
+    # outputs.tf block for this type; depends only on the fields above
+    output_block: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        attributes_block = "".join(f"      {a} = v.{a}\n" for a in self.attributes)
+        self.output_block = (
+            f'output "{self.output_key}" {{\n'
+            f'  description = "{self.description} in this resource group"\n'
+            f"  value = {{\n"
+            f"    for k, v in local.all_{self.output_key} : k => {{\n"
+            f"{attributes_block}"
+            "    }\n  }\n}\n\n"
+        )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ParsedResource:
     """A parsed resource from main.tf."""
     resource_type: str
     resource_name: str  # Terraform resource name (e.g., "res-0")
     azure_name: Optional[str] = None  # Actual Azure resource name
+    # Captured key attributes (see key_attribute_names), for composite keys
+    attrs: Dict[str, str] = field(default_factory=dict)
+
+
+# =============================================================================
+# EMBEDDED DEFAULT CONFIGURATION (used if YAML not available)
+# =============================================================================
+
+# Built once at import; load_config() hands out this tuple as-is
+_DEFAULT_CONFIGS: Tuple[ResourceTypeConfig, ...] = (
+    # Networking
+    ResourceTypeConfig(
+        terraform_type="azurerm_virtual_network",
+        output_key="vnets",
+        key_attribute="name",
+        description="Virtual Networks",
+        attributes=["id", "name", "location", "resource_group_name", "address_space"],
+    ),
+    ResourceTypeConfig(
+        terraform_type="azurerm_subnet",
+        output_key="subnets",
+        key_attribute="composite",
+        key_template="${virtual_network_name}/${name}",
+        description="Subnets",
+        attributes=["id", "name", "virtual_network_name", "resource_group_name", "address_prefixes"],
+    ),
+    ResourceTypeConfig(
+        terraform_type="azurerm_network_security_group",
+        output_key="nsgs",
+        key_attribute="name",
+        description="Network Security Groups",
+        attributes=["id", "name", "location", "resource_group_name"],
+    ),
+    ResourceTypeConfig(
+        terraform_type="azurerm_network_interface",
+        output_key="nics",
+        key_attribute="name",
+        description="Network Interfaces",
+        attributes=["id", "name", "location", "resource_group_name", "private_ip_address"],
+    ),
+    ResourceTypeConfig(
+        terraform_type="azurerm_public_ip",
+        output_key="public_ips",
+        key_attribute="name",
+        description="Public IPs",
+        attributes=["id", "name", "location", "resource_group_name", "ip_address"],
+    ),
+    ResourceTypeConfig(
+        terraform_type="azurerm_route_table",
+        output_key="route_tables",
+        key_attribute="name",
+        description="Route Tables",
+        attributes=["id", "name", "location", "resource_group_name"],
+    ),
+    ResourceTypeConfig(
+        terraform_type="azurerm_nat_gateway",
+        output_key="nat_gateways",
+        key_attribute="name",
+        description="NAT Gateways",
+        attributes=["id", "name", "location", "resource_group_name"],
+    ),
+    # Compute
+    ResourceTypeConfig(
+        terraform_type="azurerm_linux_virtual_machine",
+        output_key="linux_vms",
+        key_attribute="name",
+        description="Linux Virtual Machines",
+        attributes=["id", "name", "location", "resource_group_name", "size", "private_ip_address", "admin_username"],
+    ),
+    ResourceTypeConfig(
+        terraform_type="azurerm_windows_virtual_machine",
+        output_key="windows_vms",
+        key_attribute="name",
+        description="Windows Virtual Machines",
+        attributes=["id", "name", "location", "resource_group_name", "size", "private_ip_address", "admin_username"],
+    ),
+    ResourceTypeConfig(
+        terraform_type="azurerm_virtual_machine",
+        output_key="classic_vms",
+        key_attribute="name",
+        description="Classic Virtual Machines",
+        attributes=["id", "name", "location", "resource_group_name"],
+    ),
+    ResourceTypeConfig(
+        terraform_type="azurerm_managed_disk",
+        output_key="managed_disks",
+        key_attribute="name",
+        description="Managed Disks",
+        attributes=["id", "name", "location", "resource_group_name", "storage_account_type", "disk_size_gb"],
+    ),
+    ResourceTypeConfig(
+        terraform_type="azurerm_availability_set",
+        output_key="availability_sets",
+        key_attribute="name",
+        description="Availability Sets",
+        attributes=["id", "name", "location", "resource_group_name"],
+    ),
+    ResourceTypeConfig(
+        terraform_type="azurerm_virtual_machine_scale_set",
+        output_key="vmss",
+        key_attribute="name",
+        description="Virtual Machine Scale Sets",
+        attributes=["id", "name", "location", "resource_group_name"],
+    ),
+    # Storage
+    ResourceTypeConfig(
+        terraform_type="azurerm_storage_account",
+        output_key="storage_accounts",
+        key_attribute="name",
+        description="Storage Accounts",
+        attributes=["id", "name", "location", "resource_group_name", "account_tier", "account_replication_type", "primary_blob_endpoint"],
+    ),
+    ResourceTypeConfig(
+        terraform_type="azurerm_storage_container",
+        output_key="storage_containers",
+        key_attribute="name",
+        description="Storage Containers",
+        attributes=["id", "name", "storage_account_name"],
+    ),
+    # Database
+    ResourceTypeConfig(
+        terraform_type="azurerm_mssql_server",
+        output_key="sql_servers",
+        key_attribute="name",
+        description="Azure SQL Servers",
+        attributes=["id", "name", "location", "resource_group_name", "fully_qualified_domain_name"],
+    ),
+    ResourceTypeConfig(
+        terraform_type="azurerm_mssql_database",
+        output_key="sql_databases",
+        key_attribute="name",
+        description="Azure SQL Databases",
+        attributes=["id", "name", "server_id"],
+    ),
+    ResourceTypeConfig(
+        terraform_type="azurerm_cosmosdb_account",
+        output_key="cosmosdb_accounts",
+        key_attribute="name",
+        description="Cosmos DB Accounts",
+        attributes=["id", "name", "location", "resource_group_name", "endpoint"],
+    ),
+    # Identity & Security
+    ResourceTypeConfig(
+        terraform_type="azurerm_key_vault",
+        output_key="key_vaults",
+        key_attribute="name",
+        description="Key Vaults",
+        attributes=["id", "name", "location", "resource_group_name", "vault_uri"],
+    ),
+    ResourceTypeConfig(
+        terraform_type="azurerm_user_assigned_identity",
+        output_key="managed_identities",
+        key_attribute="name",
+        description="User Assigned Managed Identities",
+        attributes=["id", "name", "location", "resource_group_name", "client_id", "principal_id"],
+    ),
+    # Resource Groups
+    ResourceTypeConfig(
+        terraform_type="azurerm_resource_group",
+        output_key="resource_groups",
+        key_attribute="name",
+        description="Resource Groups",
+        attributes=["id", "name", "location"],
+    ),
+)
 
 
 # =============================================================================
 # PARSER
 # =============================================================================
 
+# Parsed results are pickled here, keyed by file content and parser settings.
+# Bump PARSE_CACHE_VERSION whenever parsing or ParsedResource changes.
+PARSE_CACHE_DIR = Path(tempfile.gettempdir()) / "tf_outputs_cache"
+PARSE_CACHE_VERSION = 7
+
+# Read/write buffers for main.tf and the generated files (can run to many MB)
+READ_BUFFER_SIZE = 1 << 20
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _parse_cache_dir_usable() -> bool:
+    """
+    Create the parse cache directory if needed and check that it is ours.
+    
+    The directory lives in the shared temp dir, so only trust (unpickle
+    from) one owned by this user that others cannot write to.
+    """
+    try:
+        PARSE_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if hasattr(os, 'getuid'):
+            st = PARSE_CACHE_DIR.stat()
+            if st.st_uid != os.getuid() or st.st_mode & 0o022:
+                return False
+    except OSError:
+        return False
+    return True
+
+
+# HCL is ASCII, so every pattern below is compiled with re.ASCII: \s and
+# friends become plain ASCII class tests instead of Unicode property lookups.
+
+# Resource block header, up to and including the opening '{'
+_RESOURCE_RE = re.compile(r'resource\s+"([^"]+)"\s+"([^"]+)"\s*\{', re.ASCII)
+
+# Tokens that matter while tokenizing a block body
+_BLOCK_TOKEN_RE = re.compile(r"""
+      [{}"\#]                         # brace, string start, hash comment
+    | //                              # line comment
+    | /\*                             # block comment
+    | <<-?([A-Za-z_][A-Za-z0-9_-]*)   # heredoc opener; group 1 is the marker
+""", re.VERBOSE | re.ASCII)
+
+# Resource headers start a line (aztfexport output is terraform fmt'ed), so
+# candidates are found with a literal search instead of scanning for the regex.
+RESOURCE_ANCHOR = "\nresource"
+
+
+def _find_resource_anchor(content: str, start: int) -> int:
+    """Offset of the next line-initial 'resource' at or after start, or -1."""
+    i = content.find(RESOURCE_ANCHOR, start)
+    return i + 1 if i >= 0 else -1
+
+
+@lru_cache(maxsize=32)
+def _attrs_pattern(attr_names: Tuple[str, ...]) -> "re.Pattern":
+    """Pattern for a line holding any of attr_names = "value" (compiled once per set)."""
+    names = '|'.join(map(re.escape, attr_names))
+    return re.compile(rf'^[ \t]*(?P<k>{names})[ \t]*=[ \t]*"(?P<v>[^"]+)"',
+                      re.MULTILINE | re.ASCII)
+
+
+# ${attribute} placeholders in a composite key_template
+KEY_TEMPLATE_FIELD_RE = re.compile(r'\$\{(\w+)\}', re.ASCII)
+
+
+def key_attribute_names(resource_configs: Sequence["ResourceTypeConfig"]) -> Dict[str, Tuple[str, ...]]:
+    """
+    Top-level attributes the parser must capture per resource type.
+    
+    Always 'name', plus every ${placeholder} in a composite key_template.
+    """
+    names = {}
+    for config in resource_configs:
+        attrs = ['name']
+        if config.key_template:
+            for field_name in KEY_TEMPLATE_FIELD_RE.findall(config.key_template):
+                if field_name not in attrs:
+                    attrs.append(field_name)
+        names[config.terraform_type] = tuple(attrs)
+    return names
+
+
+@lru_cache(maxsize=None)
+def _heredoc_end_pattern(marker: str) -> "re.Pattern":
+    """Pattern for the line that closes a heredoc started with <<marker or <<-marker."""
+    return re.compile(rf'^[ \t]*{re.escape(marker)}[ \t]*$', re.MULTILINE | re.ASCII)
+
+
 class TerraformParser:
     """
     Simple parser for Terraform HCL files.
@@ -236,96 +353,226 @@ class TerraformParser:
     For complex HCL, consider using python-hcl2 library.
     """
     
-    # Pattern to match resource blocks (captures up to but NOT including the {)
-    RESOURCE_PATTERN = re.compile(
-        r'resource\s+"([^"]+)"\s+"([^"]+)"\s*\{',
-        re.MULTILINE
-    )
+    # Pattern to match resource block headers (module-level _RESOURCE_RE)
+    RESOURCE_PATTERN = _RESOURCE_RE
     
-    def __init__(self, main_tf_path: str):
+    def __init__(self, main_tf_path: str,
+                 attribute_names: Optional[Dict[str, Tuple[str, ...]]] = None,
+                 known_types: Optional[FrozenSet[str]] = None):
         self.main_tf_path = Path(main_tf_path)
         self.content = self._read_file()
+        # Per-type attributes to capture (see key_attribute_names); defaults
+        # to what the embedded resource types need
+        if attribute_names is None:
+            attribute_names = key_attribute_names(load_config(None))
+        self.attribute_names = attribute_names
+        # Every block is scanned with one alternation over all of these
+        self._all_attribute_names = tuple(sorted(
+            {"name"}.union(*attribute_names.values())
+        ))
+        # Types outside this set are recorded by name only (None = extract all)
+        self.known_types = known_types
         
     def _read_file(self) -> str:
         """Read the main.tf file."""
         if not self.main_tf_path.exists():
             raise FileNotFoundError(f"File not found: {self.main_tf_path}")
-        return self.main_tf_path.read_text()
+        
+        # One bulk read through a 1 MiB buffer, then a single decode
+        with open(self.main_tf_path, 'rb', buffering=READ_BUFFER_SIZE) as f:
+            data = f.read()
+        
+        # Hash the raw bytes now so the parse cache never re-encodes the text
+        self._content_digest = hashlib.sha256(data).digest()
+        
+        content = data.decode('utf-8')
+        # Match read_text()'s newline translation for CRLF exports
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
     
-    def _extract_block_content(self, start_pos: int) -> str:
+    def _scan_block_for(self, start_pos: int,
+                        wanted: Tuple[str, ...]) -> Tuple[Dict[str, str], int]:
         """
-        Extract the content of a resource block.
-        start_pos should be right after the opening '{'.
-        Returns the content between { and }.
+        Read the wanted top-level attributes of the block whose body starts
+        at start_pos (right after its opening '{').
+        
+        Attribute lines are found with one pattern (all attributes any type
+        needs); the brace/string/comment/heredoc tokenizer only advances as
+        far as the next candidate line to learn its depth, so braces in
+        strings or comments don't count and candidates inside them are
+        dropped. Scanning stops as soon as every wanted attribute has been
+        seen at depth 0, or when the block closes.
+        
+        Returns (values, resume position). The rest of a block left unscanned
+        is skipped by the line-initial anchor search in _iter_resource_blocks.
         """
-        brace_count = 1  # We're already inside the first brace
+        values: Dict[str, str] = {}
+        if not wanted:
+            return values, start_pos
         
-        for i, char in enumerate(self.content[start_pos:], start_pos):
-            if char == '{':
-                brace_count += 1
-            elif char == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    return self.content[start_pos:i]
+        content = self.content
+        depth = 0  # Nesting below the block body
+        pos = start_pos
+        
+        for match in _attrs_pattern(self._all_attribute_names).finditer(content, start_pos):
+            candidate = match.start()
+            
+            # Advance the tokenizer to the candidate line
+            while pos < candidate:
+                token = _BLOCK_TOKEN_RE.search(content, pos, candidate)
+                if token is None:
+                    pos = candidate
+                    break
+                
+                text = token.group(0)
+                pos = token.end()
+                
+                if text == '{':
+                    depth += 1
+                elif text == '}':
+                    depth -= 1
+                    if depth < 0:
+                        # Block closed before the candidate
+                        return values, pos
+                elif text == '"':
+                    # Skip to the next unescaped quote
+                    while True:
+                        pos = content.find('"', pos)
+                        if pos < 0:
+                            return values, len(content)
+                        backslashes = 0
+                        while content[pos - 1 - backslashes] == '\\':
+                            backslashes += 1
+                        pos += 1
+                        if backslashes % 2 == 0:
+                            break
+                elif text == '/*':
+                    pos = content.find('*/', pos)
+                    if pos < 0:
+                        return values, len(content)
+                    pos += 2
+                elif text.startswith('<<'):
+                    # Heredoc: skip to the line holding only the closing marker
+                    end_marker = _heredoc_end_pattern(token.group(1)).search(content, pos)
+                    if end_marker is None:
+                        return values, len(content)
+                    pos = end_marker.end()
+                else:
+                    # '#' or '//' line comment
+                    pos = content.find('\n', pos)
+                    if pos < 0:
+                        return values, len(content)
+            
+            if pos > candidate:
+                # Candidate sits inside a string, comment or heredoc
+                continue
+            
+            key = match.group('k')
+            if depth == 0 and key in wanted and key not in values:
+                values[key] = match.group('v')
+                if len(values) == len(wanted):
+                    return values, match.end()
         
-        return ""
+        return values, pos
     
-    def _extract_top_level_attribute(self, block_content: str, attr_name: str) -> Optional[str]:
+    def _iter_resource_blocks(self) -> Iterator[Tuple[str, str, Optional[Dict[str, str]]]]:
         """
-        Extract a top-level attribute value from a resource block's content.
-        Only matches attributes at depth 0 (not inside nested blocks).
-        """
-        depth = 0
+        Yield (resource_type, resource_name, values) per resource block.
         
-        # Pattern to match attribute = "value"
-        pattern = re.compile(rf'^\s*{attr_name}\s*=\s*"([^"]+)"')
+        One forward pass over the file: a literal str.find jumps between
+        line-initial 'resource' keywords and each candidate is confirmed with
+        RESOURCE_PATTERN. Only as much of a block body is tokenized as
+        _scan_block_for needs to find the type's attributes; values is None
+        for unconfigured types, whose bodies are not scanned at all.
+        """
+        content = self.content
+        known_types = self.known_types
+        pos = 0 if content.startswith('resource') else _find_resource_anchor(content, 0)
         
-        for line in block_content.split('\n'):
-            # Check for attribute BEFORE updating depth (so we catch top-level attrs)
-            if depth == 0:
-                match = pattern.match(line)
-                if match:
-                    return match.group(1)
+        while pos >= 0:
+            match = self.RESOURCE_PATTERN.match(content, pos)
+            if match is None:
+                pos = _find_resource_anchor(content, pos)
+                continue
             
-            # Track brace depth for this line
-            depth += line.count('{') - line.count('}')
-        
-        return None
+            resource_type = match.group(1)
+            # match.end() is right after the '{'
+            pos = match.end()
+            values = None
+            if known_types is None or resource_type in known_types:
+                # Top-level name plus anything the type's key template needs
+                wanted = self.attribute_names.get(resource_type, ("name",))
+                values, pos = self._scan_block_for(pos, wanted)
+            
+            yield resource_type, match.group(2), values
+            pos = _find_resource_anchor(content, pos)
     
-    def parse(self) -> Dict[str, List[ParsedResource]]:
+    def _cache_path(self) -> Path:
+        """Cache file for this content and parser configuration."""
+        digest = hashlib.sha256()
+        known = sorted(self.known_types) if self.known_types is not None else None
+        digest.update(f"{PARSE_CACHE_VERSION}\0{sorted(self.attribute_names.items())!r}\0"
+                      f"{known!r}\0".encode('utf-8'))
+        digest.update(self._content_digest)
+        return PARSE_CACHE_DIR / f"{digest.hexdigest()}.pkl"
+    
+    def parse(self, use_cache: bool = True) -> Dict[str, List[ParsedResource]]:
         """
         Parse main.tf and return resources grouped by type.
         
+        Results are cached on disk by content hash, so re-running on an
+        unchanged file skips parsing. The cache is best-effort; pass
+        use_cache=False to bypass it.
+        
         Returns:
             Dict mapping resource type to list of ParsedResource objects.
         """
+        if not use_cache or not _parse_cache_dir_usable():
+            return self._parse()
+        
+        cache_path = self._cache_path()
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            pass
+        
+        resources = self._parse()
+        
+        # Write to a temp file and rename so readers never see a partial cache
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(resources, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+        
+        return resources
+    
+    def _parse(self) -> Dict[str, List[ParsedResource]]:
+        """Parse main.tf without consulting the cache."""
         resources: Dict[str, List[ParsedResource]] = {}
         
-        for match in self.RESOURCE_PATTERN.finditer(self.content):
-            resource_type = match.group(1)
-            resource_name = match.group(2)
-            
-            # Extract the resource block content (match.end() is right after the '{')
-            block_content = self._extract_block_content(match.end())
-            
-            # Find the top-level name attribute
-            azure_name = self._extract_top_level_attribute(block_content, "name")
-            
-            # For subnets, also get virtual_network_name
-            vnet_name = None
-            if resource_type == "azurerm_subnet":
-                vnet_name = self._extract_top_level_attribute(block_content, "virtual_network_name")
+        for resource_type, resource_name, values in self._iter_resource_blocks():
+            # Unconfigured types only show up as counts in the output
+            if values is None:
+                resources.setdefault(resource_type, []).append(
+                    ParsedResource(resource_type=resource_type, resource_name=resource_name)
+                )
+                continue
             
             resource = ParsedResource(
                 resource_type=resource_type,
                 resource_name=resource_name,
-                azure_name=azure_name
+                azure_name=values.get("name"),
+                attrs=values
             )
             
-            # Store vnet_name as extra data for subnet key generation
-            if vnet_name:
-                resource._vnet_name = vnet_name
-            
             if resource_type not in resources:
                 resources[resource_type] = []
             resources[resource_type].append(resource)
@@ -337,158 +584,294 @@ class TerraformParser:
 # GENERATOR
 # =============================================================================
 
+LOCALS_HEADER = """\
+# =============================================================================
+# LOCALS - Auto-generated by generate_outputs.py
+# =============================================================================
+# This file maps aztfexport resources by their Azure names for easier reference.
+# DO NOT EDIT MANUALLY - regenerate using the script if main.tf changes.
+# =============================================================================
+
+locals {
+"""
+
+OUTPUTS_HEADER = """\
+# =============================================================================
+# OUTPUTS - Auto-generated by generate_outputs.py
+# =============================================================================
+# These outputs expose resources for consumption by:
+#   - The subscription-level catalog (merges all RG outputs)
+#   - Cross-state references via terraform_remote_state
+# DO NOT EDIT MANUALLY - regenerate using the script if main.tf changes.
+# =============================================================================
+
+"""
+
 class OutputGenerator:
     """Generates locals.tf and outputs.tf from parsed resources."""
     
     def __init__(self, resources: Dict[str, List[ParsedResource]], 
-                 resource_configs: List[ResourceTypeConfig]):
+                 resource_configs: Sequence[ResourceTypeConfig]):
         self.resources = resources
         self.config_map = {c.terraform_type: c for c in resource_configs}
+        
+        # Sort once; both generators and the metadata block share this order
+        self._sorted_items = sorted(resources.items())
+        self._sorted_types = [t for t, _ in self._sorted_items]
+        self._known_items = [(t, rs) for t, rs in self._sorted_items if t in self.config_map]
+        
+        # Map keys computed once per resource: type -> [(key, resource)],
+        # key None for resources without a name attribute (kept in place so
+        # locals.tf can flag them where they occur)
+        self._keyed: Dict[str, List[Tuple[Optional[str], ParsedResource]]] = {
+            t: [(self._resource_key(self.config_map[t], r), r) for r in rs]
+            for t, rs in self._known_items
+        }
+    
+    @staticmethod
+    def _resource_key(config: ResourceTypeConfig, resource: ParsedResource) -> Optional[str]:
+        """Map key for a resource in all_<output_key>, or None if it has no name."""
+        if not resource.azure_name:
+            return None
+        
+        if config.key_attribute == "composite" and config.key_template:
+            # Render composite keys like "${virtual_network_name}/${name}";
+            # fall back to the bare name when an attribute wasn't captured
+            try:
+                return KEY_TEMPLATE_FIELD_RE.sub(
+                    lambda m: resource.attrs[m.group(1)], config.key_template
+                )
+            except KeyError:
+                pass
+        
+        return resource.azure_name
     
     def generate_locals(self) -> str:
         """Generate locals.tf content."""
-        lines = [
-            "# =============================================================================",
-            "# LOCALS - Auto-generated by generate_outputs.py",
-            "# =============================================================================",
-            "# This file maps aztfexport resources by their Azure names for easier reference.",
-            "# DO NOT EDIT MANUALLY - regenerate using the script if main.tf changes.",
-            "# =============================================================================",
-            "",
-            "locals {",
-        ]
+        buf = io.StringIO()
+        self.write_locals(buf)
+        return buf.getvalue()
+    
+    def write_locals(self, out: TextIO) -> None:
+        """Stream locals.tf content to a text file object."""
+        w = out.write
+        w(LOCALS_HEADER)
         
         # Track which types we actually have
         types_found = []
         
-        for resource_type, resource_list in sorted(self.resources.items()):
+        for resource_type, resource_list in self._sorted_items:
             config = self.config_map.get(resource_type)
             if not config:
                 # Unknown resource type - add a comment but skip
-                lines.append(f"  # Skipped unknown type: {resource_type} ({len(resource_list)} resources)")
+                w(f"  # Skipped unknown type: {resource_type} ({len(resource_list)} resources)\n")
                 continue
             
             types_found.append(config.output_key)
             
-            lines.append("")
-            lines.append(f"  # {config.description}")
-            lines.append(f"  all_{config.output_key} = {{")
+            w(f"\n  # {config.description}\n  all_{config.output_key} = {{\n")
+            
+            # Same shape for every entry of this type: format once, fill per resource
+            entry_fmt = '    "%s" = ' + resource_type + '.%s\n'
             
-            for resource in resource_list:
-                if not resource.azure_name:
-                    lines.append(f"    # Warning: {resource.resource_name} has no name attribute")
+            for key, resource in self._keyed[resource_type]:
+                if key is None:
+                    w(f"    # Warning: {resource.resource_name} has no name attribute\n")
                     continue
                 
-                # Generate the map key
-                if config.key_attribute == "composite" and config.key_template:
-                    # Handle composite keys like "vnet_name/subnet_name"
-                    if hasattr(resource, '_vnet_name'):
-                        key = f"{resource._vnet_name}/{resource.azure_name}"
-                    else:
-                        key = resource.azure_name
-                else:
-                    key = resource.azure_name
-                
-                tf_ref = f"{resource_type}.{resource.resource_name}"
-                lines.append(f'    "{key}" = {tf_ref}')
+                w(entry_fmt % (key, resource.resource_name))
             
-            lines.append("  }")
-        
-        lines.append("}")
-        lines.append("")
+            w("  }\n")
         
-        return "\n".join(lines)
+        w("}\n")
     
     def generate_outputs(self) -> str:
         """Generate outputs.tf content."""
-        lines = [
-            "# =============================================================================",
-            "# OUTPUTS - Auto-generated by generate_outputs.py",
-            "# =============================================================================",
-            "# These outputs expose resources for consumption by:",
-            "#   - The subscription-level catalog (merges all RG outputs)",
-            "#   - Cross-state references via terraform_remote_state",
-            "# DO NOT EDIT MANUALLY - regenerate using the script if main.tf changes.",
-            "# =============================================================================",
-            "",
-        ]
+        buf = io.StringIO()
+        self.write_outputs(buf)
+        return buf.getvalue()
+    
+    def write_outputs(self, out: TextIO) -> None:
+        """Stream outputs.tf content to a text file object."""
+        w = out.write
+        w(OUTPUTS_HEADER)
         
-        for resource_type, resource_list in sorted(self.resources.items()):
-            config = self.config_map.get(resource_type)
-            if not config:
-                continue
+        for resource_type, resource_list in self._known_items:
+            config = self.config_map[resource_type]
             
             # Skip if no resources have names
-            named_resources = [r for r in resource_list if r.azure_name]
-            if not named_resources:
+            if all(key is None for key, _ in self._keyed[resource_type]):
                 continue
             
-            lines.append(f'output "{config.output_key}" {{')
-            lines.append(f'  description = "{config.description} in this resource group"')
-            lines.append(f"  value = {{")
-            lines.append(f"    for k, v in local.all_{config.output_key} : k => {{")
-            
-            # Add each attribute
-            for attr in config.attributes:
-                lines.append(f"      {attr} = v.{attr}")
-            
-            lines.append("    }")
-            lines.append("  }")
-            lines.append("}")
-            lines.append("")
+            w(config.output_block)
         
         # Add metadata output
-        resource_types_list = ', '.join([f'"{rt}"' for rt in sorted(list(self.resources.keys()))])
-        lines.extend([
-            "# Metadata about this export",
-            'output "_metadata" {',
-            '  description = "Metadata about this legacy RG export"',
-            "  value = {",
-            f'    resource_count = {sum(len(r) for r in self.resources.values())}',
-            f'    resource_types = [{resource_types_list}]',
-            '    generated_by   = "generate_outputs.py"',
-            "  }",
-            "}",
-            "",
-        ])
-        
-        return "\n".join(lines)
+        resource_types_list = ', '.join([f'"{rt}"' for rt in self._sorted_types])
+        w("# Metadata about this export\n"
+          'output "_metadata" {\n'
+          '  description = "Metadata about this legacy RG export"\n'
+          "  value = {\n"
+          f'    resource_count = {sum(len(r) for r in self.resources.values())}\n'
+          f'    resource_types = [{resource_types_list}]\n'
+          '    generated_by   = "generate_outputs.py"\n'
+          "  }\n"
+          "}\n")
+
+
+def _write_if_changed(path: Path, write: Callable[[TextIO], None]) -> bool:
+    """
+    Write the content produced by write(out) to path unless the file
+    already holds exactly that.
+    
+    Leaves the mtime of unchanged files alone so downstream tooling
+    (terraform init, CI caches) doesn't see a spurious change. A new file
+    has nothing to compare against, so it is streamed straight to disk.
+    Returns True if the file was written.
+    """
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        with open(path, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER_SIZE) as f:
+            write(f)
+        return True
+    
+    buf = io.StringIO()
+    write(buf)
+    data = buf.getvalue().encode('utf-8')
+    if size == len(data):
+        with open(path, 'rb', buffering=READ_BUFFER_SIZE) as f:
+            if f.read() == data:
+                return False
+    
+    with open(path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(data)
+    return True
 
 
 # =============================================================================
 # MAIN
 # =============================================================================
 
-def load_config(config_path: Optional[str]) -> List[ResourceTypeConfig]:
+@lru_cache(maxsize=4)
+def _load_yaml(config_path: str, mtime_ns: int) -> Tuple[ResourceTypeConfig, ...]:
+    """Build configs from a YAML file; mtime_ns keys the cache to the file's contents."""
+    with open(config_path, 'r') as f:
+        data = yaml.load(f, Loader=_YAML_LOADER)
+    
+    return tuple(
+        ResourceTypeConfig(
+            terraform_type=item['terraform_type'],
+            output_key=item['output_key'],
+            key_attribute=item['key_attribute'],
+            description=item.get('description', ''),
+            attributes=item.get('attributes', ['id', 'name']),
+            key_template=item.get('key_template')
+        )
+        for item in data.get('resource_types', [])
+    )
+
+
+def load_config(config_path: Optional[str]) -> Tuple[ResourceTypeConfig, ...]:
     """Load resource type configuration from YAML or use defaults."""
     if config_path and HAS_YAML and Path(config_path).exists():
-        with open(config_path, 'r') as f:
-            data = yaml.safe_load(f)
-        
-        configs = []
-        for item in data.get('resource_types', []):
-            configs.append(ResourceTypeConfig(
-                terraform_type=item['terraform_type'],
-                output_key=item['output_key'],
-                key_attribute=item['key_attribute'],
-                description=item.get('description', ''),
-                attributes=item.get('attributes', ['id', 'name']),
-                key_template=item.get('key_template')
-            ))
-        return configs
+        return _load_yaml(config_path, os.stat(config_path).st_mtime_ns)
     else:
         # Use embedded defaults
-        return [
-            ResourceTypeConfig(
-                terraform_type=item['terraform_type'],
-                output_key=item['output_key'],
-                key_attribute=item['key_attribute'],
-                description=item.get('description', ''),
-                attributes=item.get('attributes', ['id', 'name']),
-                key_template=item.get('key_template')
-            )
-            for item in DEFAULT_RESOURCE_TYPES
-        ]
+        return _DEFAULT_CONFIGS
+
+
+# =============================================================================
+# BATCH MODE
+# =============================================================================
+
+def _process_one(main_tf: str, config_path: Optional[str],
+                 use_cache: bool) -> Tuple[str, int, int, Optional[str]]:
+    """
+    Parse one main.tf and write locals.tf/outputs.tf beside it.
+    
+    Batch worker: returns (main_tf, resource count, files rewritten,
+    error message or None).
+    """
+    configs = load_config(config_path)
+    try:
+        parser_obj = TerraformParser(
+            main_tf,
+            key_attribute_names(configs),
+            known_types=frozenset(c.terraform_type for c in configs),
+        )
+        resources = parser_obj.parse(use_cache=use_cache)
+        
+        generator = OutputGenerator(resources, configs)
+        output_dir = Path(main_tf).parent
+        written = (_write_if_changed(output_dir / "locals.tf", generator.write_locals)
+                   + _write_if_changed(output_dir / "outputs.tf", generator.write_outputs))
+    except (OSError, UnicodeDecodeError) as e:
+        return main_tf, 0, 0, str(e)
+    
+    return main_tf, sum(len(r) for r in resources.values()), written, None
+
+
+# Folders az_export_rg.py moves raw aztfexport output into: <dir>_raw_<timestamp>
+RAW_BACKUP_DIR_RE = re.compile(r'_raw_\d{8}_\d{6}$', re.ASCII)
+
+
+def _find_main_tfs(root: Path) -> List[str]:
+    """
+    Every main.tf under root, sorted.
+    
+    Hidden folders (.terraform/modules, .git) and raw export backups are not
+    descended into; their main.tf files are not ours to generate for.
+    """
+    main_tfs = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames
+                       if not d.startswith('.') and not RAW_BACKUP_DIR_RE.search(d)]
+        if "main.tf" in filenames:
+            main_tfs.append(os.path.join(dirpath, "main.tf"))
+    return sorted(main_tfs)
+
+
+def run_batch(root: Path, config_path: Optional[str], jobs: Optional[int],
+              use_cache: bool) -> int:
+    """Generate files for every main.tf under root in parallel; returns exit code."""
+    main_tfs = _find_main_tfs(root)
+    if not main_tfs:
+        print(f"No main.tf files found under {root}")
+        return 1
+    
+    print(f"Found {len(main_tfs)} main.tf files under {root}")
+    
+    # Parsing is pure-Python CPU work, so fan out over processes
+    failures = 0
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        results = executor.map(
+            _process_one,
+            main_tfs,
+            [config_path] * len(main_tfs),
+            [use_cache] * len(main_tfs),
+        )
+        for main_tf, count, written, error in results:
+            if error:
+                failures += 1
+                print(f"  ERROR {main_tf}: {error}")
+            elif written:
+                print(f"  {main_tf}: {count} resources")
+            else:
+                print(f"  {main_tf}: {count} resources (outputs unchanged)")
+    
+    print(f"\nGenerated locals.tf/outputs.tf for {len(main_tfs) - failures} of {len(main_tfs)} files")
+    return 1 if failures else 0
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for worker counts: an integer of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value!r}")
+    return number
 
 
 def main():
@@ -500,6 +883,7 @@ Examples:
     python generate_outputs.py ./main.tf
     python generate_outputs.py /path/to/rg-folder/main.tf --config resource_types.yaml
     python generate_outputs.py ./main.tf --dry-run
+    python generate_outputs.py --batch legacy-import/sub-prod --jobs 8
 
 The script will create locals.tf and outputs.tf in the same directory as main.tf.
         """
@@ -507,9 +891,23 @@ The script will create locals.tf and outputs.tf in the same directory as main.tf
     
     parser.add_argument(
         "main_tf",
+        nargs="?",
         help="Path to main.tf generated by aztfexport"
     )
     
+    parser.add_argument(
+        "--batch",
+        metavar="DIR",
+        help="Process every main.tf under DIR in parallel"
+    )
+    
+    parser.add_argument(
+        "--jobs", "-j",
+        type=_positive_int,
+        default=None,
+        help="Worker processes for --batch (default: CPU count)"
+    )
+    
     parser.add_argument(
         "--config", "-c",
         help="Path to resource_types.yaml configuration file",
@@ -522,6 +920,12 @@ The script will create locals.tf and outputs.tf in the same directory as main.tf
         help="Print output to stdout instead of writing files"
     )
     
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always re-parse main.tf instead of using the parse cache"
+    )
+    
     parser.add_argument(
         "--output-dir", "-o",
         help="Output directory (default: same as main.tf)",
@@ -530,6 +934,14 @@ The script will create locals.tf and outputs.tf in the same directory as main.tf
     
     args = parser.parse_args()
     
+    if args.batch:
+        if args.main_tf or args.dry_run or args.output_dir:
+            parser.error("--batch cannot be combined with main_tf, --dry-run or --output-dir")
+        sys.exit(run_batch(Path(args.batch), args.config, args.jobs, not args.no_cache))
+    
+    if not args.main_tf:
+        parser.error("main_tf is required unless --batch is given")
+    
     # Determine output directory
     main_tf_path = Path(args.main_tf)
     output_dir = Path(args.output_dir) if args.output_dir else main_tf_path.parent
@@ -542,8 +954,12 @@ The script will create locals.tf and outputs.tf in the same directory as main.tf
     # Parse main.tf
     print(f"Parsing {main_tf_path}...")
     try:
-        parser_obj = TerraformParser(str(main_tf_path))
-        resources = parser_obj.parse()
+        parser_obj = TerraformParser(
+            str(main_tf_path),
+            key_attribute_names(configs),
+            known_types=frozenset(c.terraform_type for c in configs),
+        )
+        resources = parser_obj.parse(use_cache=not args.no_cache)
     except FileNotFoundError as e:
         print(f"Error: {e}")
         sys.exit(1)
@@ -558,28 +974,28 @@ The script will create locals.tf and outputs.tf in the same directory as main.tf
     
     # Generate files
     generator = OutputGenerator(resources, configs)
-    locals_content = generator.generate_locals()
-    outputs_content = generator.generate_outputs()
     
     if args.dry_run:
         print("\n" + "=" * 60)
         print("LOCALS.TF (dry run)")
         print("=" * 60)
-        print(locals_content)
+        generator.write_locals(sys.stdout)
+        print()
         print("\n" + "=" * 60)
         print("OUTPUTS.TF (dry run)")
         print("=" * 60)
-        print(outputs_content)
+        generator.write_outputs(sys.stdout)
+        print()
     else:
         locals_path = output_dir / "locals.tf"
         outputs_path = output_dir / "outputs.tf"
         
-        locals_path.write_text(locals_content)
-        outputs_path.write_text(outputs_content)
+        locals_written = _write_if_changed(locals_path, generator.write_locals)
+        outputs_written = _write_if_changed(outputs_path, generator.write_outputs)
         
         print(f"\nGenerated files:")
-        print(f"  {locals_path}")
-        print(f"  {outputs_path}")
+        print(f"  {locals_path}" + ("" if locals_written else " (unchanged, not rewritten)"))
+        print(f"  {outputs_path}" + ("" if outputs_written else " (unchanged, not rewritten)"))
         print("\nNext steps:")
         print("  1. Review the generated files")
         print("  2. Add backend configuration to providers.tf")
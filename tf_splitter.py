@@ -13,23 +13,63 @@ Usage:
 Cross-platform: Works on Windows and Linux
 """
 
+import hashlib
+import mmap
+import os
 import re
 import sys
 import argparse
 from pathlib import Path
 from collections import defaultdict
-from typing import Optional
+from functools import lru_cache
+from typing import FrozenSet, Iterator, Optional, Tuple
 
 # Try to import yaml, fall back to json config if not available
 try:
     import yaml
     YAML_AVAILABLE = True
+    # libyaml-backed loader is several times faster when PyYAML was built with it
+    _YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 except ImportError:
     YAML_AVAILABLE = False
     print("Warning: PyYAML not installed. Install with: pip install pyyaml")
     print("Falling back to embedded default mappings.\n")
 
 
+# Every top-level block header, found with one search over the raw bytes of
+# the (memory-mapped) input. Groups 1-3 are set for resource/data blocks
+# (resource "type" "name" {), groups 4-5 for the others (variable "name" {,
+# output "name" {, locals {, terraform { ...). [^\S\n] is whitespace that
+# stays on the header's line.
+HEADER_RE = re.compile(
+    rb'^(?:(resource|data)[^\S\n]+"([^"\n]+)"[^\S\n]+"([^"\n]+)"[^\S\n]*\{'
+    rb'|(variable|output|locals|terraform|provider|module)[^\S\n]*(?:"([^"\n]+)")?[^\S\n]*\{)',
+    re.MULTILINE
+)
+
+# Dedicated file for each non-resource block type HEADER_RE recognizes
+SPECIAL_BLOCK_MAP = {
+    'terraform': 'versions.tf',
+    'provider': 'providers.tf',
+    'variable': 'variables.tf',
+    'output': 'outputs.tf',
+    'locals': 'locals.tf',
+    'module': 'modules.tf',
+}
+
+# Line ending for written files (text mode used to translate '\n' on Windows)
+NEWLINE = os.linesep.encode('ascii')
+
+# Blank line written between blocks
+BLOCK_SEPARATOR = b'\n\n'
+
+# Split files go out with one vectored write where the OS has writev and no
+# newline translation is needed; otherwise through a large buffered writer.
+USE_WRITEV = hasattr(os, 'writev') and NEWLINE == b'\n'
+IOV_MAX = os.sysconf('SC_IOV_MAX') if hasattr(os, 'sysconf') and USE_WRITEV else 1024
+WRITE_BUFFER_SIZE = 1 << 20
+
+
 def get_script_dir() -> Path:
     """Get the directory where this script is located."""
     return Path(__file__).parent.resolve()
@@ -45,7 +85,7 @@ def load_config(config_path: Optional[Path] = None) -> dict:
     if YAML_AVAILABLE and config_path.exists():
         print(f"Loading config from: {config_path}")
         with open(config_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=_YAML_LOADER)
     
     # Fallback to embedded defaults
     print("Using embedded default mappings")
@@ -131,94 +171,191 @@ def build_type_to_file_map(config: dict) -> dict:
     return type_to_file
 
 
-def parse_tf_blocks(content: str) -> list:
+def build_prefix_pattern(type_to_file: dict):
+    """
+    Compile the mapped types into one alternation for prefix matching.
+    Alternatives keep the mapping's order, so pattern.match() returns the same
+    first-listed prefix that a linear startswith() scan would.
+    Returns None for an empty mapping.
+    """
+    if not type_to_file:
+        return None
+    return re.compile('|'.join(map(re.escape, type_to_file)))
+
+
+def iter_tf_blocks(content) -> Iterator[Tuple[str, Optional[str], Optional[str], memoryview]]:
     """
     Parse all top-level blocks (resource, data, variable, output, locals, etc.)
     from a Terraform file.
     
-    Returns list of tuples: (block_type, resource_type, resource_name, full_block_text)
+    content is the file as bytes (or an mmap of it). Headers are located by
+    HEADER_RE searches that resume after each block, so the file is never
+    split into lines and lines outside headers are never visited in Python.
+    
+    Yields tuples, in file order: (block_type, resource_type, resource_name, full_block_text)
+    with full_block_text as a memoryview into content (no copy is made; the
+    views keep content, e.g. the mapping, alive until they are dropped).
     For non-resource blocks like 'locals', resource_type and resource_name may be None.
     """
-    blocks = []
-    
-    # Pattern for resource/data blocks: resource "type" "name" {
-    resource_pattern = r'^(resource|data)\s+"([^"]+)"\s+"([^"]+)"\s*\{'
-    
-    # Pattern for other blocks: variable "name" {, output "name" {, locals {, terraform {
-    other_block_pattern = r'^(variable|output|locals|terraform|provider|module)\s*(?:"([^"]+)")?\s*\{'
-    
-    lines = content.split('\n')
-    i = 0
+    view = memoryview(content)
+    pos = 0
     
-    while i < len(lines):
-        line = lines[i]
+    while True:
+        match = HEADER_RE.search(content, pos)
+        if match is None:
+            return
         
-        # Check for resource/data block
-        match = re.match(resource_pattern, line)
-        if match:
-            block_type = match.group(1)
-            resource_type = match.group(2)
-            resource_name = match.group(3)
-            
-            # Find the complete block
-            block_lines, end_idx = extract_block(lines, i)
-            block_text = '\n'.join(block_lines)
-            
-            blocks.append((block_type, resource_type, resource_name, block_text))
-            i = end_idx + 1
-            continue
+        # Find the complete block (header match starts at its line start)
+        start = match.start()
+        end = extract_block(content, start)
+        block_text = view[start:end]
         
-        # Check for other block types
-        match = re.match(other_block_pattern, line)
-        if match:
-            block_type = match.group(1)
-            block_name = match.group(2)  # May be None for 'locals' or 'terraform'
-            
-            block_lines, end_idx = extract_block(lines, i)
-            block_text = '\n'.join(block_lines)
-            
-            blocks.append((block_type, None, block_name, block_text))
-            i = end_idx + 1
-            continue
+        if match.group(1):
+            # resource/data block
+            block_type = match.group(1).decode('ascii')
+            resource_type = match.group(2).decode('utf-8')
+            resource_name = match.group(3).decode('utf-8')
+            yield block_type, resource_type, resource_name, block_text
+        else:
+            block_type = match.group(4).decode('ascii')
+            block_name = match.group(5)  # May be None for 'locals' or 'terraform'
+            if block_name is not None:
+                block_name = block_name.decode('utf-8')
+            yield block_type, None, block_name, block_text
         
-        i += 1
-    
-    return blocks
+        pos = end + 1
 
 
-def extract_block(lines: list, start_idx: int) -> tuple:
+def parse_tf_blocks(content) -> list:
+    """All of iter_tf_blocks(content) as a list."""
+    return list(iter_tf_blocks(content))
+
+
+def extract_block(content, start: int) -> int:
     """
-    Extract a complete block starting at start_idx, handling nested braces.
-    Returns (block_lines, end_index).
+    Find the end of a complete block whose first line starts at offset start,
+    handling nested braces.
+    Returns the offset of the end of the line holding the closing brace (its
+    newline, or the end of content), so the block is content[start:end].
     """
-    block_lines = []
+    size = len(content)
     brace_count = 0
     started = False
     
-    for i in range(start_idx, len(lines)):
-        line = lines[i]
-        block_lines.append(line)
-        
-        # Count braces (simple approach - doesn't handle braces in strings perfectly
-        # but works for aztfexport output which is well-formatted)
-        for char in line:
-            if char == '{':
-                brace_count += 1
-                started = True
-            elif char == '}':
-                brace_count -= 1
+    # Jump from brace to brace instead of walking lines (simple approach -
+    # doesn't handle braces in strings perfectly but works for aztfexport
+    # output which is well-formatted)
+    next_open = content.find(b'{', start)
+    next_close = content.find(b'}', start)
+    
+    while True:
+        if next_open >= 0 and (next_close < 0 or next_open < next_close):
+            pos = next_open
+            brace_count += 1
+            started = True
+            next_open = content.find(b'{', pos + 1)
+        elif next_close >= 0:
+            pos = next_close
+            brace_count -= 1
+            next_close = content.find(b'}', pos + 1)
+        else:
+            # If we get here, block wasn't properly closed
+            return size
         
         if started and brace_count == 0:
-            return block_lines, i
+            eol = content.find(b'\n', pos + 1)
+            if eol < 0:
+                eol = size
+            # The block ends with this line unless more braces follow on it
+            if not (pos < next_open < eol or pos < next_close < eol):
+                return eol
+
+
+def _has_content(filepath: Path, parts: list) -> bool:
+    """True if filepath already holds exactly the concatenation of parts."""
+    try:
+        if filepath.stat().st_size != sum(map(len, parts)):
+            return False
+    except FileNotFoundError:
+        return False
+    
+    # Same size: compare streaming BLAKE2b digests (neither side is joined)
+    new = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        new.update(part)
+    
+    old = hashlib.blake2b(digest_size=16)
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(WRITE_BUFFER_SIZE), b''):
+            old.update(chunk)
+    
+    return new.digest() == old.digest()
+
+
+def write_blocks(filepath: Path, parts: list) -> bool:
+    """
+    Write a file's parts (block buffers, each followed by BLOCK_SEPARATOR)
+    with the final separator turned into the trailing newline, without first
+    joining them into one big buffer.
     
-    # If we get here, block wasn't properly closed
-    return block_lines, len(lines) - 1
+    Returns False, leaving the file untouched, if it already holds exactly
+    this content (a re-run after a no-change edit rewrites nothing).
+    """
+    parts[-1] = b'\n'  # Trailing newline
+    if NEWLINE != b'\n':
+        parts = [bytes(part).replace(b'\n', NEWLINE) for part in parts]
+    
+    if _has_content(filepath, parts):
+        return False
+    
+    if not USE_WRITEV:
+        with open(filepath, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            for part in parts:
+                f.write(part)
+        return True
+    
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        idx = 0
+        while idx < len(parts):
+            batch = parts[idx:idx + IOV_MAX]
+            written = os.writev(fd, batch)
+            # Drop fully written buffers; keep the unwritten tail of a partial one
+            for buf in batch:
+                if written < len(buf):
+                    parts[idx] = memoryview(buf)[written:]
+                    break
+                written -= len(buf)
+                idx += 1
+    finally:
+        os.close(fd)
+    return True
 
 
-def get_target_file(resource_type: str, type_to_file: dict, default_file: str, skip_types: list) -> Optional[str]:
+def _is_same_file(stat: os.stat_result, filepath: Path) -> bool:
+    """Check whether filepath exists and is the file described by stat."""
+    try:
+        return os.path.samestat(stat, os.stat(filepath))
+    except FileNotFoundError:
+        return False
+
+
+def _map_file(f):
+    """Read-only mmap of an open file, prefaulted where the OS supports it."""
+    populate = getattr(mmap, 'MAP_POPULATE', 0)
+    if populate:
+        return mmap.mmap(f.fileno(), 0, flags=mmap.MAP_SHARED | populate, prot=mmap.PROT_READ)
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def get_target_file(resource_type: str, type_to_file: dict, default_file: str,
+                    skip_types: FrozenSet[str], prefix_pattern=None) -> Optional[str]:
     """
     Determine which file a resource type should go into.
     Returns None if the type should be skipped.
+    skip_types should be a frozenset (O(1) membership; split_terraform_file
+    converts the config list once). prefix_pattern is
+    build_prefix_pattern(type_to_file), built on demand if omitted.
     """
     if resource_type in skip_types:
         return None
@@ -229,9 +366,12 @@ def get_target_file(resource_type: str, type_to_file: dict, default_file: str, s
     
     # Try prefix matching for resource types with suffixes
     # e.g., azurerm_mssql_server_extended_auditing_policy -> databases-sql.tf
-    for mapped_type, target_file in type_to_file.items():
-        if resource_type.startswith(mapped_type):
-            return target_file
+    if prefix_pattern is None:
+        prefix_pattern = build_prefix_pattern(type_to_file)
+    if prefix_pattern is not None:
+        match = prefix_pattern.match(resource_type)
+        if match:
+            return type_to_file[match.group(0)]
     
     return default_file
 
@@ -242,58 +382,68 @@ def split_terraform_file(input_file: Path, output_dir: Path, config: dict) -> di
     
     Returns a summary dict with file names and block counts.
     """
-    content = input_file.read_text(encoding='utf-8')
-    blocks = parse_tf_blocks(content)
+    with open(input_file, 'rb') as f:
+        content = b'' if os.fstat(f.fileno()).st_size == 0 else _map_file(f)
+    
+    if content and content.find(b'\r') >= 0:
+        # Normalize CRLF/CR line endings like text-mode reading did
+        mapped, content = content, content[:].replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+        mapped.close()
     
     type_to_file = build_type_to_file_map(config)
+    prefix_pattern = build_prefix_pattern(type_to_file)
     default_file = config.get('default_file', 'other.tf')
-    skip_types = config.get('skip_types', [])
+    skip_types = frozenset(config.get('skip_types') or ())
+    
+    # Resource types repeat heavily; resolve each distinct one only once
+    @lru_cache(maxsize=None)
+    def resolve(rtype: str) -> Optional[str]:
+        return get_target_file(rtype, type_to_file, default_file, skip_types, prefix_pattern)
     
-    # Group blocks by target file
-    file_blocks = defaultdict(list)
-    special_blocks = []  # terraform, provider, variable, output, locals
+    # Group blocks by target file, directly as the parts write_blocks emits
+    file_parts = defaultdict(list)
     skipped = []
     
-    for block_type, resource_type, name, block_text in blocks:
+    # Route blocks as they are parsed; no list of all blocks is built. Blocks
+    # are views into the mapping, which is unmapped once they're dropped.
+    for block_type, resource_type, name, block_text in iter_tf_blocks(content):
         if block_type in ('resource', 'data'):
-            target = get_target_file(resource_type, type_to_file, default_file, skip_types)
+            target = resolve(resource_type)
             if target is None:
                 skipped.append((resource_type, name))
-            else:
-                file_blocks[target].append(block_text)
+                continue
         else:
             # Special blocks go to dedicated files
-            if block_type == 'terraform':
-                special_blocks.append(('versions.tf', block_text))
-            elif block_type == 'provider':
-                special_blocks.append(('providers.tf', block_text))
-            elif block_type == 'variable':
-                special_blocks.append(('variables.tf', block_text))
-            elif block_type == 'output':
-                special_blocks.append(('outputs.tf', block_text))
-            elif block_type == 'locals':
-                special_blocks.append(('locals.tf', block_text))
-            elif block_type == 'module':
-                special_blocks.append(('modules.tf', block_text))
-    
-    # Add special blocks to file_blocks
-    for target_file, block_text in special_blocks:
-        file_blocks[target_file].append(block_text)
+            target = SPECIAL_BLOCK_MAP.get(block_type)
+            if not target:
+                continue
+        
+        parts = file_parts[target]
+        parts.append(block_text)
+        parts.append(BLOCK_SEPARATOR)
     
     # Create output directory
     output_dir.mkdir(parents=True, exist_ok=True)
     
+    # Blocks are views into the input mapping. If the input is also one of
+    # the targets (e.g. re-splitting an already split folder), truncating it
+    # would pull the pages out from under every view, so copy them out first.
+    input_stat = os.stat(input_file)
+    if any(_is_same_file(input_stat, output_dir / filename) for filename in file_parts):
+        for parts in file_parts.values():
+            parts[:] = [bytes(part) for part in parts]
+    
     # Write files
     summary = {'files': {}, 'skipped': skipped}
     
-    for filename, blocks_list in sorted(file_blocks.items()):
+    for filename, parts in sorted(file_parts.items()):
         filepath = output_dir / filename
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write('\n\n'.join(blocks_list))
-            f.write('\n')  # Trailing newline
+        block_count = len(parts) // 2
+        # Only targets that received blocks get a list, so no file is empty
+        written = write_blocks(filepath, parts)
         
-        summary['files'][filename] = len(blocks_list)
-        print(f"  {filename}: {len(blocks_list)} blocks")
+        summary['files'][filename] = block_count
+        print(f"  {filename}: {block_count} blocks" + ("" if written else " (unchanged)"))
     
     return summary
 
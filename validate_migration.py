@@ -13,14 +13,21 @@ Usage:
     python validate_migration.py --subscription sub-prod-core
     python validate_migration.py --subscription sub-prod-core --check-drift
     python validate_migration.py --catalog-only
+
+Optional: pip install orjson (faster parsing of `terraform output -json`)
 """
 
 import argparse
+import io
 import json
+import os
+import re
 import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional, TextIO
 
 try:
     from config_loader import get_config, get_provider_version, validate_config
@@ -28,92 +35,195 @@ try:
 except ImportError:
     HAS_CONFIG_LOADER = False
 
+# Optional: orjson parses large `terraform output -json` documents several
+# times faster than the stdlib and returns the same objects
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 
 # =============================================================================
 # COLORS
 # =============================================================================
 
 class Colors:
-    GREEN = '\033[0;32m'
-    RED = '\033[0;31m'
-    YELLOW = '\033[1;33m'
-    BLUE = '\033[0;34m'
-    NC = '\033[0m'  # No Color
+    # Plain text when stdout isn't a terminal (CI logs, pipes, files)
+    ENABLED = sys.stdout.isatty()
 
-    @staticmethod
-    def success(text: str) -> str:
-        return f"{Colors.GREEN}✓ {text}{Colors.NC}"
+    GREEN = '\033[0;32m' if ENABLED else ''
+    RED = '\033[0;31m' if ENABLED else ''
+    YELLOW = '\033[1;33m' if ENABLED else ''
+    BLUE = '\033[0;34m' if ENABLED else ''
+    NC = '\033[0m' if ENABLED else ''  # No Color
 
-    @staticmethod
-    def error(text: str) -> str:
-        return f"{Colors.RED}✗ {text}{Colors.NC}"
+    # Prefixes built once; each helper is then a single concatenation
+    _SUCCESS = f"{GREEN}✓ "
+    _ERROR = f"{RED}✗ "
+    _WARNING = f"{YELLOW}⚠ "
+    _INFO = f"{BLUE}ℹ "
 
-    @staticmethod
-    def warning(text: str) -> str:
-        return f"{Colors.YELLOW}⚠ {text}{Colors.NC}"
+    @classmethod
+    def success(cls, text: str) -> str:
+        return cls._SUCCESS + text + cls.NC
 
-    @staticmethod
-    def info(text: str) -> str:
-        return f"{Colors.BLUE}ℹ {text}{Colors.NC}"
+    @classmethod
+    def error(cls, text: str) -> str:
+        return cls._ERROR + text + cls.NC
+
+    @classmethod
+    def warning(cls, text: str) -> str:
+        return cls._WARNING + text + cls.NC
+
+    @classmethod
+    def info(cls, text: str) -> str:
+        return cls._INFO + text + cls.NC
 
 
 # =============================================================================
 # TERRAFORM HELPERS
 # =============================================================================
 
+class TerraformRunner:
+    """
+    Run terraform commands, remembering each (cwd, args) result for the rest
+    of the run so repeated or concurrent identical calls spawn terraform once.
+    Call invalidate() after anything that changes state (e.g. an apply).
+    """
+
+    def __init__(self):
+        self._results: Dict[Tuple[str, Tuple[str, ...]], Tuple[bool, str, str]] = {}
+        self._key_locks: Dict[Tuple[str, Tuple[str, ...]], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def run(self, cwd: Path, *args, timeout: int = 300) -> Tuple[bool, str, str]:
+        """Run (or recall) a terraform command and return (success, stdout, stderr)."""
+        key = (str(cwd), args)
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Concurrent callers with the same key wait for the first one's result
+        with key_lock:
+            with self._lock:
+                result = self._results.get(key)
+            if result is None:
+                result = self._execute(cwd, args, timeout)
+                with self._lock:
+                    self._results[key] = result
+
+        return result
+
+    def invalidate(self, cwd: Optional[Path] = None):
+        """Forget remembered results for cwd, or for every directory."""
+        with self._lock:
+            if cwd is None:
+                self._results.clear()
+            else:
+                for key in [k for k in self._results if k[0] == str(cwd)]:
+                    del self._results[key]
+
+    @staticmethod
+    def _execute(cwd: Path, args: Tuple[str, ...], timeout: int) -> Tuple[bool, str, str]:
+        cmd = ['terraform'] + list(args)
+
+        try:
+            result = subprocess.run(
+                cmd,
+                cwd=cwd,
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+
+            return result.returncode == 0, result.stdout, result.stderr
+
+        except subprocess.TimeoutExpired:
+            return False, "", "Command timed out"
+        except Exception as e:
+            return False, "", str(e)
+
+
+_terraform = TerraformRunner()
+
+
 def run_terraform_command(cwd: Path, *args, timeout: int = 300) -> Tuple[bool, str, str]:
     """
     Run a terraform command and return (success, stdout, stderr).
+    Results are remembered per (cwd, args) for the rest of the run.
     """
-    cmd = ['terraform'] + list(args)
-
-    try:
-        result = subprocess.run(
-            cmd,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
+    return _terraform.run(cwd, *args, timeout=timeout)
 
-        return result.returncode == 0, result.stdout, result.stderr
 
-    except subprocess.TimeoutExpired:
-        return False, "", "Command timed out"
-    except Exception as e:
-        return False, "", str(e)
+def _count_plan_changes(line: str) -> int:
+    """Sum the counts in a "Plan: 3 to add, 2 to change, 1 to destroy" line."""
+    changes = 0
+    parts = line.split()
+    for i, part in enumerate(parts):
+        if part == 'to' and i > 0:
+            try:
+                changes += int(parts[i-1])
+            except ValueError:
+                pass
+    return changes
 
 
-def terraform_plan(directory: Path) -> Tuple[bool, int]:
+def terraform_plan(directory: Path, timeout: int = 300) -> Tuple[bool, int]:
     """
     Run terraform plan and return (is_clean, resource_changes).
 
+    Output is streamed line by line instead of captured whole; parsing stops
+    at the "No changes" or "Plan:" line and the rest is drained unread.
+
     Returns:
         (True, 0) if plan is clean
         (False, N) if there are N changes
+        (False, -1) if terraform plan failed
     """
-    success, stdout, stderr = run_terraform_command(
-        directory, 'plan', '-detailed-exitcode', '-out=tfplan'
-    )
+    cmd = ['terraform', 'plan', '-detailed-exitcode', '-out=tfplan']
 
-    # Exit codes: 0 = no changes, 1 = error, 2 = changes present
-    if "No changes" in stdout:
-        return True, 0
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            cwd=directory,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True
+        )
+    except OSError:
+        return False, -1
 
-    # Try to count changes
-    changes = 0
-    for line in stdout.split('\n'):
-        if 'Plan:' in line:
-            # Extract number from "Plan: 3 to add, 2 to change, 1 to destroy"
-            parts = line.split()
-            for i, part in enumerate(parts):
-                if part == 'to' and i > 0:
-                    try:
-                        changes += int(parts[i-1])
-                    except ValueError:
-                        pass
+    # Kill a hung plan, as subprocess.run's timeout used to
+    timer = threading.Timer(timeout, proc.kill)
+    timer.start()
+
+    result = None
+    try:
+        for line in proc.stdout:
+            if "No changes" in line:
+                result = (True, 0)
+                break
+            if 'Plan:' in line:
+                changes = _count_plan_changes(line)
+                result = (changes == 0, changes)
+                break
+
+        # Let terraform finish rather than killing it mid-run: it holds the
+        # state lock and still has to write tfplan
+        for _ in proc.stdout:
+            pass
+        returncode = proc.wait()
+    finally:
+        timer.cancel()
+        proc.stdout.close()
 
-    return changes == 0, changes
+    # Exit codes: 0 = no changes, 1 = error, 2 = changes present
+    if returncode == 0:
+        return True, 0
+    if returncode == 2:
+        return result if result is not None else (False, 0)
+    return False, -1
 
 
 def terraform_output(directory: Path) -> Dict[str, Any]:
@@ -124,11 +234,18 @@ def terraform_output(directory: Path) -> Dict[str, Any]:
         return {}
 
     try:
-        return json.loads(stdout)
+        return orjson.loads(stdout) if HAS_ORJSON else json.loads(stdout)
     except json.JSONDecodeError:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
         return {}
 
 
+# version = "x.y.z" inside the azurerm provider block of .terraform.lock.hcl
+AZURERM_VERSION_RE = re.compile(
+    r'provider\s+"registry\.terraform\.io/hashicorp/azurerm"\s*\{[^}]*?\bversion\s*=\s*"([^"]+)"'
+)
+
+
 def check_provider_version(directory: Path) -> Tuple[bool, str]:
     """Check provider version in .terraform.lock.hcl."""
     lock_file = directory / '.terraform.lock.hcl'
@@ -136,15 +253,9 @@ def check_provider_version(directory: Path) -> Tuple[bool, str]:
     if not lock_file.exists():
         return False, "No lock file found (run terraform init)"
 
-    content = lock_file.read_text()
-
-    # Extract azurerm version
-    if 'provider "registry.terraform.io/hashicorp/azurerm"' in content:
-        # Simple extraction - look for version line
-        for line in content.split('\n'):
-            if 'version' in line.lower() and '=' in line:
-                version = line.split('=')[1].strip().strip('"')
-                return True, version
+    match = AZURERM_VERSION_RE.search(lock_file.read_text())
+    if match:
+        return True, match.group(1)
 
     return False, "azurerm provider not found"
 
@@ -156,15 +267,28 @@ def check_provider_version(directory: Path) -> Tuple[bool, str]:
 class RGValidator:
     """Validate a single resource group's Terraform state."""
 
-    def __init__(self, rg_path: Path):
+    def __init__(self, rg_path: Path, check_drift: bool = False,
+                 out: Optional[TextIO] = None):
         self.rg_path = rg_path
         self.rg_name = rg_path.name
+        self.check_drift = check_drift
         self.errors = []
         self.warnings = []
+        # _check_files/_check_init results, so a repeated validate() doesn't redo them
+        self._files_ok: Optional[bool] = None
+        self._init_ok: Optional[bool] = None
+        # Names in the RG folder, listed once for the file and init checks
+        self._entry_names: Optional[set] = None
+        # Parsed `terraform output -json`, fetched once per validator
+        self._outputs: Optional[Dict[str, Any]] = None
+        # (found, version) from .terraform.lock.hcl, read once per validator
+        self._provider_version: Optional[Tuple[bool, str]] = None
+        # Where progress is printed; a buffer when RGs are validated in parallel
+        self.out = out if out is not None else sys.stdout
 
     def validate(self) -> bool:
         """Run all validations. Returns True if all pass."""
-        print(f"\n{Colors.info(f'Validating: {self.rg_name}')}")
+        print(f"\n{Colors.info(f'Validating: {self.rg_name}')}", file=self.out)
 
         # Check files exist
         if not self._check_files():
@@ -180,35 +304,56 @@ class RGValidator:
         # Check outputs
         self._check_outputs()
 
-        # Check plan (if requested)
-        # self._check_plan()
+        # Check plan (if requested) - the one terraform plan this RG gets
+        if self.check_drift:
+            self._check_plan()
 
         return len(self.errors) == 0
 
+    def _entries(self) -> set:
+        """Names in the RG folder, from a single os.scandir pass."""
+        if self._entry_names is None:
+            try:
+                with os.scandir(self.rg_path) as it:
+                    self._entry_names = {entry.name for entry in it}
+            except OSError:
+                self._entry_names = set()
+        return self._entry_names
+
     def _check_files(self) -> bool:
         """Check required files exist."""
+        if self._files_ok is not None:
+            return self._files_ok
+
         required_files = ['main.tf', 'providers.tf', 'outputs.tf', 'locals.tf']
+        present = self._entries()
 
         for filename in required_files:
-            if not (self.rg_path / filename).exists():
+            if filename not in present:
                 self.errors.append(f"Missing required file: {filename}")
 
-        return len(self.errors) == 0
+        self._files_ok = len(self.errors) == 0
+        return self._files_ok
 
     def _check_init(self) -> bool:
         """Check if terraform init has been run."""
-        terraform_dir = self.rg_path / '.terraform'
+        if self._init_ok is not None:
+            return self._init_ok
 
-        if not terraform_dir.exists():
+        if '.terraform' not in self._entries():
             self.errors.append("Terraform not initialized (run: terraform init)")
+            self._init_ok = False
             return False
 
-        print(f"  {Colors.success('Terraform initialized')}")
+        print(f"  {Colors.success('Terraform initialized')}", file=self.out)
+        self._init_ok = True
         return True
 
     def _check_provider_version(self):
         """Check provider version matches expected."""
-        success, version = check_provider_version(self.rg_path)
+        if self._provider_version is None:
+            self._provider_version = check_provider_version(self.rg_path)
+        success, version = self._provider_version
 
         if not success:
             self.warnings.append(f"Could not verify provider version: {version}")
@@ -217,13 +362,19 @@ class RGValidator:
         expected_version = get_provider_version('azurerm') if HAS_CONFIG_LOADER else "~> 4.0"
 
         if version.startswith('4.'):
-            print(f"  {Colors.success(f'Provider version: {version}')}")
+            print(f"  {Colors.success(f'Provider version: {version}')}", file=self.out)
         else:
             self.warnings.append(f"Provider version {version} may not match expected {expected_version}")
 
+    def _outputs_cached(self) -> Dict[str, Any]:
+        """terraform outputs for this RG; every output check shares one fetch."""
+        if self._outputs is None:
+            self._outputs = terraform_output(self.rg_path)
+        return self._outputs
+
     def _check_outputs(self):
         """Check that outputs are present."""
-        outputs = terraform_output(self.rg_path)
+        outputs = self._outputs_cached()
 
         if not outputs:
             self.warnings.append("No outputs found in state")
@@ -238,17 +389,20 @@ class RGValidator:
             if not key.startswith('_'):
                 resource_types.add(key)
 
-        print(f"  {Colors.success(f'Found {len(resource_types)} output types')}")
+        print(f"  {Colors.success(f'Found {len(resource_types)} output types')}", file=self.out)
 
     def _check_plan(self) -> bool:
         """Check that terraform plan shows no changes."""
-        print(f"  Checking for drift...")
+        print(f"  Checking for drift...", file=self.out)
 
         is_clean, changes = terraform_plan(self.rg_path)
 
         if is_clean:
-            print(f"  {Colors.success('No drift detected')}")
+            print(f"  {Colors.success('No drift detected')}", file=self.out)
             return True
+        elif changes < 0:
+            self.errors.append("terraform plan failed (run it in the RG folder for details)")
+            return False
         else:
             self.errors.append(f"Drift detected: {changes} changes")
             return False
@@ -257,11 +411,25 @@ class RGValidator:
         """Print validation summary."""
         if self.errors:
             for error in self.errors:
-                print(f"  {Colors.error(error)}")
+                print(f"  {Colors.error(error)}", file=self.out)
 
         if self.warnings:
             for warning in self.warnings:
-                print(f"  {Colors.warning(warning)}")
+                print(f"  {Colors.warning(warning)}", file=self.out)
+
+
+def validate_rg(rg_path: Path, check_drift: bool = False) -> Tuple[bool, str]:
+    """
+    Validate one RG with its output captured.
+    Returns (passed, printed output) so parallel runs can print RGs in order.
+    """
+    out = io.StringIO()
+    validator = RGValidator(rg_path, check_drift=check_drift, out=out)
+
+    passed = validator.validate()
+    validator.print_summary()
+
+    return passed, out.getvalue()
 
 
 class CatalogValidator:
@@ -271,6 +439,14 @@ class CatalogValidator:
         self.catalog_path = catalog_path
         self.errors = []
         self.warnings = []
+        # Parsed `terraform output -json`, fetched once per validator
+        self._outputs: Optional[Dict[str, Any]] = None
+
+    def _outputs_cached(self) -> Dict[str, Any]:
+        """terraform outputs for the catalog; every output check shares one fetch."""
+        if self._outputs is None:
+            self._outputs = terraform_output(self.catalog_path)
+        return self._outputs
 
     def validate(self) -> bool:
         """Run all validations."""
@@ -299,7 +475,7 @@ class CatalogValidator:
         print(f"  {Colors.success('Catalog structure valid')}")
 
         # Check outputs
-        outputs = terraform_output(self.catalog_path)
+        outputs = self._outputs_cached()
 
         if not outputs:
             print(f"  {Colors.error('No catalog outputs found')}")
@@ -322,6 +498,17 @@ class CatalogValidator:
 # MAIN
 # =============================================================================
 
+def _positive_int(value: str) -> int:
+    """argparse type for worker counts: an integer of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value!r}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Validate Terraform migration state',
@@ -345,6 +532,13 @@ def main():
         help='Run terraform plan to check for drift (slower)'
     )
 
+    parser.add_argument(
+        '--jobs', '-j',
+        type=_positive_int,
+        default=None,
+        help='Resource groups to validate in parallel (default: min(16, RG count))'
+    )
+
     parser.add_argument(
         '--base-path',
         type=Path,
@@ -406,18 +600,18 @@ def main():
 
     print(f"\nFound {len(rg_folders)} resource group(s) to validate")
 
-    # Validate each RG
-    failed = []
-    for rg_path in sorted(rg_folders):
-        validator = RGValidator(rg_path)
-
-        if args.check_drift:
-            validator._check_plan()
+    # Validate RGs in parallel; the time goes to waiting on terraform
+    # subprocesses. Each RG's output is buffered and printed in folder order.
+    rg_folders = sorted(rg_folders)
+    jobs = args.jobs or min(16, len(rg_folders))
 
-        if not validator.validate():
-            failed.append(rg_path.name)
-
-        validator.print_summary()
+    failed = []
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = executor.map(validate_rg, rg_folders, [args.check_drift] * len(rg_folders))
+        for rg_path, (passed, output) in zip(rg_folders, results):
+            sys.stdout.write(output)
+            if not passed:
+                failed.append(rg_path.name)
 
     # Summary
     print("\n" + "=" * 60)